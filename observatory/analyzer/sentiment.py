@@ -1,11 +1,13 @@
 """Simple sentiment analysis using TextBlob."""
 
-from textblob import TextBlob
-from statistics import mean
+import math
+from bisect import bisect_right
+from textblob.en import sentiment as _pattern_sentiment
+from statistics import fmean
 from datetime import datetime, timedelta
+from observatory.database.connection import execute_query, execute_many
+from observatory.cache import ttl_cached, invalidate
 
-# Cache sentiment results
-_sentiment_cache = {}
 SENTIMENT_CACHE_TTL = 600  # 10 minutes
 
 
@@ -14,92 +16,101 @@ def analyze_sentiment(text: str) -> float:
     Analyze sentiment of text.
     
     Returns polarity from -1.0 (negative) to +1.0 (positive).
+
+    Calls TextBlob's pattern lexicon directly: same score as
+    ``TextBlob(text).sentiment.polarity`` without building a blob per text.
     """
     if not text:
         return 0.0
     
-    blob = TextBlob(text)
-    return blob.sentiment.polarity
+    return _pattern_sentiment(text)[0]
+
+
+# Polarity bands as sorted breakpoints for bisect_right: value i applies
+# below breakpoint i. nextafter() turns the inclusive "<=" lower bands into
+# the strict bounds bisect_right needs.
+_LABEL_BREAKS = (math.nextafter(-0.3, math.inf), 0.3)
+_LABELS = ("negative", "neutral", "positive")
+
+_EMOJI_BREAKS = (math.nextafter(-0.5, math.inf), math.nextafter(-0.2, math.inf), 0.2, 0.5)
+_EMOJIS = ("😞", "😐", "😶", "🙂", "😊")
 
 
 def get_sentiment_label(polarity: float) -> str:
-    """Get a human-readable label for sentiment polarity."""
-    if polarity >= 0.3:
-        return "positive"
-    elif polarity <= -0.3:
-        return "negative"
-    else:
-        return "neutral"
+    """Get a human-readable label for sentiment polarity.
+
+    <= -0.3 is negative, >= 0.3 positive, anything between neutral.
+    """
+    return _LABELS[bisect_right(_LABEL_BREAKS, polarity)]
 
 
 def get_sentiment_emoji(polarity: float) -> str:
     """Get an emoji representing the sentiment."""
-    if polarity >= 0.5:
-        return "😊"
-    elif polarity >= 0.2:
-        return "🙂"
-    elif polarity <= -0.5:
-        return "😞"
-    elif polarity <= -0.2:
-        return "😐"
-    else:
-        return "😶"
+    return _EMOJIS[bisect_right(_EMOJI_BREAKS, polarity)]
 
 
 def average_sentiment(texts: list[str]) -> float:
     """Calculate average sentiment across multiple texts."""
-    if not texts:
-        return 0.0
+    scores = [_pattern_sentiment(t)[0] for t in texts if t]
+    return fmean(scores) if scores else 0.0
+
+
+def summarize_polarity(avg: float | None, sample_size: int) -> dict:
+    """Build the sentiment summary for an average polarity over sample_size posts."""
+    if not sample_size:
+        return {"polarity": 0.0, "label": "neutral", "emoji": "😶", "sample_size": 0}
     
-    scores = [analyze_sentiment(t) for t in texts if t]
-    return mean(scores) if scores else 0.0
+    return {
+        "polarity": round(avg, 2),
+        "label": get_sentiment_label(avg),
+        "emoji": get_sentiment_emoji(avg),
+        "sample_size": sample_size,
+    }
 
 
+@ttl_cached("posts", ttl_seconds=SENTIMENT_CACHE_TTL)
 async def get_recent_sentiment(hours: int = 24) -> dict:
-    """Get average sentiment for recent posts using optimized sampling and caching."""
-    from observatory.database.connection import execute_query
+    """Get average sentiment for recent posts from their stored polarity."""
+    start = (datetime.utcnow() - timedelta(hours=hours)).isoformat()
     
-    # Check cache first
-    cache_key = f"sentiment_{hours}"
-    now = datetime.utcnow()
-    if cache_key in _sentiment_cache:
-        cached_result, cached_time = _sentiment_cache[cache_key]
-        if (now - cached_time).total_seconds() < SENTIMENT_CACHE_TTL:
-            return cached_result
+    # Polarity is scored once at ingestion; posts without text stay NULL
+    # and are skipped by AVG/COUNT.
+    rows = await execute_query("""
+        SELECT AVG(polarity) AS polarity, COUNT(polarity) AS sample_size
+        FROM posts
+        WHERE created_at >= ?
+    """, (start,))
     
-    start = (now - timedelta(hours=hours)).isoformat()
+    if not rows:
+        return summarize_polarity(None, 0)
+    return summarize_polarity(rows[0]["polarity"], rows[0]["sample_size"])
+
+
+async def backfill_polarity(limit: int = 500) -> int:
+    """
+    Score posts stored without a polarity, newest first.
     
-    # Optimize: Get only a sample of recent posts instead of all
-    # Sample 500 posts max to avoid processing huge amounts of text
+    Covers posts ingested before the polarity column existed. Returns the
+    number of posts scored.
+    """
+    # Pinned to the partial index: once everything is scored it's empty, and
+    # ANALYZE writes no stats for it, so the planner would otherwise walk
+    # idx_posts_created_at across every post looking for NULLs. Read on the
+    # reader pool, so an open poller transaction's rows are never picked up.
     posts = await execute_query("""
-        SELECT title, content FROM posts
-        WHERE created_at >= ?
+        SELECT id, title, content FROM posts INDEXED BY idx_posts_unscored
+        WHERE polarity IS NULL
+        AND (COALESCE(title, '') != '' OR COALESCE(content, '') != '')
         ORDER BY created_at DESC
-        LIMIT 500
-    """, (start,))
+        LIMIT ?
+    """, (limit,))
     
     if not posts:
-        result = {"polarity": 0.0, "label": "neutral", "emoji": "😶", "sample_size": 0}
-        _sentiment_cache[cache_key] = (result, now)
-        return result
-    
-    # Only analyze title + content if both present (avoid empty strings)
-    texts = [f"{p.get('title', '')} {p.get('content', '')}".strip() 
-             for p in posts if p.get('title') or p.get('content')]
-    
-    if not texts:
-        result = {"polarity": 0.0, "label": "neutral", "emoji": "😶", "sample_size": 0}
-        _sentiment_cache[cache_key] = (result, now)
-        return result
-    
-    avg = average_sentiment(texts)
-    
-    result = {
-        "polarity": round(avg, 2),
-        "label": get_sentiment_label(avg),
-        "emoji": get_sentiment_emoji(avg),
-        "sample_size": len(texts),
-    }
+        return 0
     
-    _sentiment_cache[cache_key] = (result, now)
-    return result
+    await execute_many("UPDATE posts SET polarity = ? WHERE id = ?", [
+        (analyze_sentiment(f"{p['title'] or ''} {p['content'] or ''}".strip()), p["id"])
+        for p in posts
+    ])
+    invalidate("posts")
+    return len(posts)
@@ -1,75 +1,87 @@
 """Aggregate statistics and snapshots."""
 
+import asyncio
 import json
-import time
+import math
 from datetime import datetime, timedelta
-from observatory.database.connection import get_db, execute_query
-
-# ---------------------------------------------------------------------------
-# Cache entries: (monotonic_time, value)
-# ---------------------------------------------------------------------------
-_cache: dict[str, tuple[float, object]] = {}
-
-def _cached(key: str, ttl: int):
-    entry = _cache.get(key)
-    if entry and time.monotonic() - entry[0] < ttl:
-        return entry[1]
-    return None
-
-def _store(key: str, value):
-    _cache[key] = (time.monotonic(), value)
-    return value
-
+from observatory.database.connection import execute_query, execute_insert, transaction
+from observatory.cache import ttl_cached, invalidate
+from observatory.analyzer.trends import get_top_words
+from observatory.analyzer.sentiment import get_recent_sentiment, summarize_polarity
 
 def invalidate_stats_cache() -> None:
     """Invalidate all stats caches."""
-    _cache.clear()
+    invalidate("stats")
+    invalidate("posts")
 
 
 # ---------------------------------------------------------------------------
 # Queries
 # ---------------------------------------------------------------------------
 
-async def get_stats() -> dict:
-    """Get current platform statistics (cached 5 min)."""
-    cached = _cached("stats", 300)
-    if cached is not None:
-        return cached
-
+def _stats_bounds() -> tuple[str, str, str]:
+    """(today_start, one_hour_ago, one_day_ago) bound as ?1, ?2, ?3 in _STATS_COLUMNS."""
     now = datetime.utcnow()
-    today_start   = now.replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
-    one_hour_ago  = (now - timedelta(hours=1)).isoformat()
-    one_day_ago   = (now - timedelta(hours=24)).isoformat()
+    return (
+        now.replace(hour=0, minute=0, second=0, microsecond=0).isoformat(),
+        (now - timedelta(hours=1)).isoformat(),
+        (now - timedelta(hours=24)).isoformat(),
+    )
 
-    # Single round-trip; covering index idx_posts_created_agent handles
-    # the COUNT(DISTINCT agent_name) subqueries without touching the heap.
-    result = await execute_query("""
-        SELECT
+
+# Select list shared by get_stats() and get_dashboard_bundle(). The three
+# posts counters are conditional aggregates over a single scan of the
+# covering index idx_posts_created_agent, so the heap is never touched.
+_STATS_COLUMNS = """
             (SELECT COUNT(*) FROM agents)   AS total_agents,
-            (SELECT COUNT(*) FROM posts)    AS total_posts,
+            COUNT(*)                        AS total_posts,
             (SELECT COUNT(*) FROM comments) AS total_comments,
             (SELECT COUNT(*) FROM submolts) AS total_submolts,
-            (SELECT COUNT(*)               FROM posts WHERE created_at >= ?) AS posts_today,
-            (SELECT COUNT(DISTINCT agent_name) FROM posts WHERE created_at >= ?) AS active_agents_1h,
-            (SELECT COUNT(DISTINCT agent_name) FROM posts WHERE created_at >= ?) AS active_agents_24h
-    """, (today_start, one_hour_ago, one_day_ago))
+            COUNT(*) FILTER (WHERE created_at >= ?1) AS posts_today,
+            COUNT(DISTINCT CASE WHEN created_at >= ?2 THEN agent_name END) AS active_agents_1h,
+            COUNT(DISTINCT CASE WHEN created_at >= ?3 THEN agent_name END) AS active_agents_24h"""
+
+_STATS_SQL = f"SELECT {_STATS_COLUMNS}\n        FROM posts"
+
+# The 24h sentiment average is a pair of scalar subqueries, so it keeps
+# its own range scan on created_at.
+_DASHBOARD_SQL = f"""SELECT {_STATS_COLUMNS},
+            (SELECT AVG(polarity)   FROM posts WHERE created_at >= ?3) AS avg_polarity,
+            (SELECT COUNT(polarity) FROM posts WHERE created_at >= ?3) AS polarity_samples
+        FROM posts"""
+
 
-    value = dict(result[0]) if result else {
+@ttl_cached("posts", ttl_seconds=300)
+async def get_stats() -> dict:
+    """Get current platform statistics (cached 5 min, dropped on new posts)."""
+    result = await execute_query(_STATS_SQL, _stats_bounds())
+
+    return dict(result[0]) if result else {
         "total_agents": 0, "total_posts": 0, "total_comments": 0,
         "total_submolts": 0, "posts_today": 0,
         "active_agents_1h": 0, "active_agents_24h": 0,
     }
-    return _store("stats", value)
 
 
+@ttl_cached("posts", ttl_seconds=60)
+async def get_dashboard_bundle() -> tuple[dict, dict]:
+    """Get (stats, 24h sentiment) for the dashboard in one query (cached 1 min).
+
+    Same values as get_stats() and get_recent_sentiment(hours=24), for the
+    routes that always need both.
+    """
+    result = await execute_query(_DASHBOARD_SQL, _stats_bounds())
+
+    stats = result[0]
+    sentiment = summarize_polarity(stats.pop("avg_polarity"), stats.pop("polarity_samples"))
+    return stats, sentiment
+
+
+@ttl_cached("stats", ttl_seconds=300)
 async def get_new_agents_today() -> list[dict]:
     """Get agents first seen today (cached 5 min)."""
-    cached = _cached("new_agents_today", 300)
-    if cached is not None:
-        return cached
-
     today_start = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0).isoformat()
-    # idx_agents_first_seen covers this query.
+    # idx_agents_first_seen_name serves this range scan.
     result = await execute_query("""
         SELECT name, description, karma, first_seen_at
         FROM agents
@@ -77,20 +89,25 @@ async def get_new_agents_today() -> list[dict]:
         ORDER BY first_seen_at DESC
         LIMIT 10
     """, (today_start,))
-    return _store("new_agents_today", result)
+    return result
 
 
-async def create_snapshot() -> None:
-    """Create an hourly snapshot of platform metrics."""
-    from observatory.analyzer.trends import get_top_words
-    from observatory.analyzer.sentiment import get_recent_sentiment
+def _encode_top_words(top_words: list[dict]) -> str:
+    """Serialize the snapshot's top words as a compact JSON list."""
+    # Compact separators: no padding bytes in every stored row
+    return json.dumps([w["word"] for w in top_words], separators=(",", ":"))
 
-    db = await get_db()
-    stats     = await get_stats()
-    sentiment = await get_recent_sentiment(hours=1)
-    top_words = await get_top_words(hours=1, limit=10)
 
-    await db.execute("""
+async def create_snapshot() -> None:
+    """Create an hourly snapshot of platform metrics."""
+    # The three reads are independent; run them concurrently on the pool
+    stats, sentiment, top_words = await asyncio.gather(
+        get_stats(),
+        get_recent_sentiment(hours=1),
+        get_top_words(hours=1, limit=10),
+    )
+
+    await execute_insert("""
         INSERT INTO snapshots (
             timestamp, total_agents, total_posts, total_comments,
             active_agents_24h, avg_sentiment, top_words
@@ -102,18 +119,35 @@ async def create_snapshot() -> None:
         stats["total_comments"],
         stats["active_agents_24h"],
         sentiment["polarity"],
-        json.dumps([w["word"] for w in top_words]),
+        _encode_top_words(top_words),
     ))
-    await db.commit()
 
 
+async def refresh_graph_snapshot() -> None:
+    """Rebuild graph_snapshot from follows.
+
+    Keeps only edges whose ends are both among the agents /api/graph draws
+    as nodes (the top 100 by karma), so the route reads a small table
+    instead of scanning every follow edge.
+    """
+    async with transaction() as db:
+        await db.execute("DELETE FROM graph_snapshot")
+        await db.execute("""
+            WITH top_agents AS (
+                SELECT id FROM agents WHERE karma > 0
+                ORDER BY karma DESC LIMIT 100
+            )
+            INSERT INTO graph_snapshot (follower_id, following_id)
+            SELECT f.follower_id, f.following_id
+            FROM follows f
+            JOIN top_agents t1 ON t1.id = f.follower_id
+            JOIN top_agents t2 ON t2.id = f.following_id
+        """)
+
+
+@ttl_cached("stats", ttl_seconds=300)
 async def get_snapshot_history(hours: int = 168) -> list[dict]:
     """Get snapshot history for the given number of hours (cached 5 min)."""
-    cache_key = f"snapshot_history:{hours}"
-    cached = _cached(cache_key, 300)
-    if cached is not None:
-        return cached
-
     start = (datetime.utcnow() - timedelta(hours=hours)).isoformat()
     # idx_snapshots_timestamp covers this range scan.
     snapshots = await execute_query("""
@@ -131,20 +165,16 @@ async def get_snapshot_history(hours: int = 168) -> list[dict]:
             except json.JSONDecodeError:
                 s["top_words"] = []
 
-    return _store(cache_key, snapshots)
+    return snapshots
 
 
+@ttl_cached("stats", ttl_seconds=300)
 async def get_top_posters(limit: int = 20) -> list[dict]:
     """Get agents with the most posts (cached 5 min).
 
     idx_posts_agent_score (agent_name, score, created_at DESC) lets SQLite
     satisfy GROUP BY agent_name + SUM/AVG/MAX via an index-only scan.
     """
-    cache_key = f"top_posters:{limit}"
-    cached = _cached(cache_key, 300)
-    if cached is not None:
-        return cached
-
     result = await execute_query("""
         SELECT
             agent_name  AS name,
@@ -158,30 +188,54 @@ async def get_top_posters(limit: int = 20) -> list[dict]:
         ORDER BY post_count DESC
         LIMIT ?
     """, (limit,))
-    return _store(cache_key, result)
+    return result
 
 
+@ttl_cached("stats", ttl_seconds=900)
 async def get_activity_by_hour() -> list[dict]:
-    """Get post activity grouped by hour of day UTC (cached 15 min).
+    """Get post activity for each hour of day UTC, all 24 hours (cached 15 min).
 
     All-time histogram — changes slowly, so a longer TTL is appropriate.
+    Hours without posts come back with a post_count of 0.
     """
-    cached = _cached("activity_by_hour", 900)
-    if cached is not None:
-        return cached
-
     result = await execute_query("""
-        SELECT
-            CAST(strftime('%H', created_at) AS INTEGER) AS hour,
-            COUNT(*) AS post_count
-        FROM posts
-        WHERE created_at IS NOT NULL
-        GROUP BY hour
-        ORDER BY hour ASC
+        WITH RECURSIVE hours(hour) AS (
+            SELECT 0 UNION ALL SELECT hour + 1 FROM hours WHERE hour < 23
+        ),
+        activity AS (
+            SELECT CAST(strftime('%H', created_at) AS INTEGER) AS hour, COUNT(*) AS post_count
+            FROM posts
+            WHERE created_at IS NOT NULL
+            GROUP BY hour
+        )
+        SELECT hours.hour, COALESCE(activity.post_count, 0) AS post_count
+        FROM hours LEFT JOIN activity USING (hour)
+        ORDER BY hours.hour ASC
     """)
-    return _store("activity_by_hour", result)
+    return result
+
 
+@ttl_cached("stats", ttl_seconds=900)
+async def get_activity_histogram() -> list[dict]:
+    """Get get_activity_by_hour() rows with bar heights for the analytics page.
 
+    height_pct is sqrt-scaled against the busiest hour (min 3% for any hour
+    with posts), computed once per cache fill instead of per render.
+    """
+    activity = await get_activity_by_hour()
+    max_posts = max((h["post_count"] for h in activity), default=0)
+    histogram = []
+    for h in activity:
+        count = h["post_count"]
+        if count > 0:
+            height_pct = max(int((math.sqrt(count) / math.sqrt(max_posts)) * 100), 3)
+        else:
+            height_pct = 0
+        histogram.append({"hour": h["hour"], "post_count": count, "height_pct": height_pct})
+    return histogram
+
+
+@ttl_cached("stats", ttl_seconds=300)
 async def get_submolt_activity(limit: int = 20) -> list[dict]:
     """Get submolts ranked by post activity (cached 5 min).
 
@@ -189,11 +243,6 @@ async def get_submolt_activity(limit: int = 20) -> list[dict]:
     lets SQLite resolve the GROUP BY + COUNT DISTINCT + aggregates without
     hitting the table heap.
     """
-    cache_key = f"submolt_activity:{limit}"
-    cached = _cached(cache_key, 300)
-    if cached is not None:
-        return cached
-
     result = await execute_query("""
         SELECT
             submolt                     AS name,
@@ -208,4 +257,4 @@ async def get_submolt_activity(limit: int = 20) -> list[dict]:
         ORDER BY post_count DESC
         LIMIT ?
     """, (limit,))
-    return _store(cache_key, result)
+    return result
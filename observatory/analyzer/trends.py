@@ -1,16 +1,21 @@
 """Trend detection using word frequency analysis."""
 
 import re
+import time
 from collections import Counter
 from datetime import datetime, timedelta
-from observatory.database.connection import get_db, execute_query
+from functools import lru_cache
+from observatory.database.connection import execute_query, execute_iter, execute_many
+from observatory.cache import ttl_cached, invalidate
 
-# Cache trending words
-_trends_cache = {}
 TRENDS_CACHE_TTL = 600  # 10 minutes
+WORD_BATCH_SIZE = 1000  # posts tokenized per regex pass
+
+# Words with 3+ ASCII letters, compiled once at import
+_WORD_RE = re.compile(r'\b[a-zA-Z]{3,}\b')
 
 # Common stop words to ignore
-STOP_WORDS = {
+STOP_WORDS = frozenset({
     'the', 'a', 'an', 'is', 'are', 'was', 'were', 'i', 'you', 'we', 'they',
     'it', 'this', 'that', 'to', 'of', 'and', 'or', 'for', 'in', 'on', 'at',
     'be', 'have', 'has', 'had', 'do', 'does', 'did', 'but', 'not', 'what',
@@ -28,127 +33,112 @@ STOP_WORDS = {
     'two', 'first', 'like', 'get', 'got', 'make', 'made', 'know', 'think',
     'see', 'come', 'want', 'look', 'use', 'find', 'give', 'tell', 'try',
     'really', 'still', 'thing', 'things', 'something', 'anything', 'nothing'
-}
+})
+
+
+@lru_cache(maxsize=2)
+def _hour_start_iso(hour_bucket: int) -> str:
+    return datetime.utcfromtimestamp(hour_bucket * 3600).isoformat()
+
+
+def current_hour_iso() -> str:
+    """ISO timestamp of the start of the current UTC hour.
+
+    Formatted once per hour; later calls in the same hour hit the cache.
+    """
+    return _hour_start_iso(int(time.time()) // 3600)
 
 
 def extract_words(text: str) -> list[str]:
     """Extract meaningful words from text."""
     if not text:
         return []
-    # Find words with 3+ characters
-    words = re.findall(r'\b[a-zA-Z]{3,}\b', text.lower())
-    return [w for w in words if w not in STOP_WORDS]
+    stop_words = STOP_WORDS
+    return [w for w in _WORD_RE.findall(text.lower()) if w not in stop_words]
 
 
 async def update_word_frequency() -> None:
     """Update word frequency counts for recent posts."""
-    db = await get_db()
-    
     # Get posts from the last hour
     one_hour_ago = (datetime.utcnow() - timedelta(hours=1)).isoformat()
     
-    posts = await execute_query("""
+    # Stream the posts in batches straight into the Counter instead of
+    # materializing every row as a dict first. Each batch is tokenized in
+    # one regex pass over a single buffer. The scan runs on a reader, so it
+    # only ever sees committed posts.
+    word_counts = Counter()
+    async for batch in execute_iter("""
         SELECT title, content FROM posts
         WHERE fetched_at >= ?
-    """, (one_hour_ago,))
+    """, (one_hour_ago,), batch_size=WORD_BATCH_SIZE):
+        text = " ".join(f"{title or ''} {content or ''}" for title, content in batch)
+        word_counts.update(extract_words(text))
     
-    if not posts:
+    if not word_counts:
         return
     
-    # Count words
-    word_counts = Counter()
-    for post in posts:
-        text = f"{post.get('title', '')} {post.get('content', '')}"
-        word_counts.update(extract_words(text))
-    
     # Store in database
-    current_hour = datetime.utcnow().replace(minute=0, second=0, microsecond=0).isoformat()
+    current_hour = current_hour_iso()
     
-    for word, count in word_counts.most_common(100):
-        await db.execute("""
-            INSERT INTO word_frequency (word, hour, count)
-            VALUES (?, ?, ?)
-            ON CONFLICT (word, hour) DO UPDATE SET count = count + excluded.count
-        """, (word, current_hour, count))
+    rows = [(word, current_hour, count) for word, count in word_counts.most_common(100)]
     
-    await db.commit()
+    # One prepared statement and one transaction for the whole batch
+    await execute_many("""
+        INSERT INTO word_frequency (word, hour, count)
+        VALUES (?, ?, ?)
+        ON CONFLICT (word, hour) DO UPDATE SET count = count + excluded.count
+    """, rows)
+    invalidate("words")
 
 
+@ttl_cached("words", ttl_seconds=TRENDS_CACHE_TTL)
 async def get_trending_words(hours: int = 24, limit: int = 10) -> list[dict]:
     """
-    Get trending words comparing current period to previous period with caching.
+    Get trending words comparing current period to previous period.
+
+    Cached for 10 minutes; update_word_frequency drops the cache.
     
     Returns list of {word, count, previous_count, change_percent}
     """
-    # Check cache first
-    cache_key = f"trends_{hours}_{limit}"
     now = datetime.utcnow()
-    if cache_key in _trends_cache:
-        cached_result, cached_time = _trends_cache[cache_key]
-        if (now - cached_time).total_seconds() < TRENDS_CACHE_TTL:
-            return cached_result
-    
     current_start = (now - timedelta(hours=hours)).isoformat()
     previous_start = (now - timedelta(hours=hours * 2)).isoformat()
-    previous_end = current_start
     
-    # Get current period counts - only top 100 to reduce processing
-    current = await execute_query("""
-        SELECT word, SUM(count) as total
-        FROM word_frequency
-        WHERE hour >= ?
-        GROUP BY word
-        ORDER BY total DESC
-        LIMIT 100
-    """, (current_start,))
-    
-    # Get previous period counts - only for words we found in current period
-    if not current:
-        result = []
-        _trends_cache[cache_key] = (result, now)
-        return result
-    
-    current_words = [w['word'] for w in current]
-    
-    # Use IN clause to fetch only relevant previous data
-    placeholders = ','.join(['?' for _ in current_words])
-    previous = await execute_query(f"""
-        SELECT word, SUM(count) as total
-        FROM word_frequency
-        WHERE hour >= ? AND hour < ? AND word IN ({placeholders})
-        GROUP BY word
-    """, (previous_start, previous_end, *current_words))
-    
-    previous_counts = {p['word']: p['total'] for p in previous}
-    
-    trends = []
-    for word_data in current:
-        word = word_data['word']
-        current_count = word_data['total']
-        prev_count = previous_counts.get(word, 0)
-        
-        if prev_count == 0:
-            change = float('inf') if current_count > 2 else 0
-        else:
-            change = ((current_count - prev_count) / prev_count) * 100
-        
-        if current_count >= 3:
-            trends.append({
-                'word': word,
-                'count': current_count,
-                'previous_count': prev_count,
-                'change_percent': change if change != float('inf') else 999,
-            })
-    
-    # Sort by change percentage
-    trends.sort(key=lambda x: x['change_percent'], reverse=True)
-    result = trends[:limit]
-    _trends_cache[cache_key] = (result, now)
-    return result
+    # One query: top 100 current-period words joined to their previous-period
+    # totals. New words (no previous count) rank first with 999%.
+    return await execute_query("""
+        WITH cur AS (
+            SELECT word, SUM(count) AS total
+            FROM word_frequency
+            WHERE hour >= ?1
+            GROUP BY word
+            ORDER BY total DESC
+            LIMIT 100
+        ),
+        prev AS (
+            SELECT word, SUM(count) AS total
+            FROM word_frequency
+            WHERE hour >= ?2 AND hour < ?1 AND word IN (SELECT word FROM cur)
+            GROUP BY word
+        )
+        SELECT
+            cur.word,
+            cur.total AS count,
+            COALESCE(prev.total, 0) AS previous_count,
+            CASE
+                WHEN COALESCE(prev.total, 0) = 0 THEN 999
+                ELSE (cur.total - prev.total) * 100.0 / prev.total
+            END AS change_percent
+        FROM cur LEFT JOIN prev USING (word)
+        WHERE cur.total >= 3
+        ORDER BY change_percent DESC, cur.total DESC
+        LIMIT ?3
+    """, (current_start, previous_start, limit))
 
 
+@ttl_cached("words", ttl_seconds=300)
 async def get_top_words(hours: int = 24, limit: int = 20) -> list[dict]:
-    """Get most frequent words in the given time period."""
+    """Get most frequent words in the given time period (cached 5 min)."""
     start = (datetime.utcnow() - timedelta(hours=hours)).isoformat()
     
     return await execute_query("""
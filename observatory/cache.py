@@ -1,5 +1,7 @@
 """Response caching utility for performance optimization."""
 
+import asyncio
+import functools
 from datetime import datetime, timedelta
 from typing import Any, Optional, Callable, Awaitable
 
@@ -29,6 +31,8 @@ class Cache:
     
     def __init__(self):
         self._cache: dict[str, CacheEntry] = {}
+        # key -> task computing it, shared by concurrent misses
+        self._pending: dict[str, asyncio.Task] = {}
     
     def get(self, key: str) -> Optional[Any]:
         """Get value from cache if exists and not expired."""
@@ -50,10 +54,19 @@ class Cache:
         """Clear a specific cache key."""
         if key in self._cache:
             del self._cache[key]
+        self._pending.pop(key, None)
+    
+    def clear_prefix(self, prefix: str) -> None:
+        """Clear every cache key starting with prefix."""
+        for key in [k for k in self._cache if k.startswith(prefix)]:
+            del self._cache[key]
+        for key in [k for k in self._pending if k.startswith(prefix)]:
+            del self._pending[key]
     
     def clear_all(self) -> None:
         """Clear all cache."""
         self._cache.clear()
+        self._pending.clear()
     
     async def get_or_compute(
         self,
@@ -61,14 +74,36 @@ class Cache:
         compute_fn: Callable[[], Awaitable[Any]],
         ttl_seconds: int = 300
     ) -> Any:
-        """Get from cache or compute value if not cached."""
+        """Get from cache or compute value if not cached.
+
+        Concurrent misses on the same key share a single compute_fn call.
+        """
         cached = self.get(key)
         if cached is not None:
             return cached
         
-        result = await compute_fn()
-        self.set(key, result, ttl_seconds)
-        return result
+        task = self._pending.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._compute(key, compute_fn, ttl_seconds))
+            self._pending[key] = task
+        # Shielded so one cancelled caller doesn't cancel it for the rest
+        return await asyncio.shield(task)
+    
+    async def _compute(
+        self,
+        key: str,
+        compute_fn: Callable[[], Awaitable[Any]],
+        ttl_seconds: int
+    ) -> Any:
+        try:
+            result = await compute_fn()
+            # Skip the store if the key was cleared while computing
+            if self._pending.get(key) is asyncio.current_task():
+                self.set(key, result, ttl_seconds)
+            return result
+        finally:
+            if self._pending.get(key) is asyncio.current_task():
+                del self._pending[key]
 
 
 # Global cache instance
@@ -78,3 +113,26 @@ _global_cache = Cache()
 def get_cache() -> Cache:
     """Get global cache instance."""
     return _global_cache
+
+
+
+def ttl_cached(namespace: str, ttl_seconds: int = 300):
+    """Memoize an async function in the global cache, keyed by its arguments.
+
+    Entries live under ``namespace`` so writers can drop them all at once
+    with :func:`invalidate`.
+    """
+    def decorator(fn: Callable[..., Awaitable[Any]]):
+        @functools.wraps(fn)
+        async def wrapper(*args, **kwargs):
+            key = f"{namespace}:{fn.__name__}:{args!r}:{sorted(kwargs.items())!r}"
+            return await _global_cache.get_or_compute(
+                key, lambda: fn(*args, **kwargs), ttl_seconds
+            )
+        return wrapper
+    return decorator
+
+
+def invalidate(namespace: str) -> None:
+    """Drop all entries memoized under namespace."""
+    _global_cache.clear_prefix(f"{namespace}:")
@@ -1,6 +1,7 @@
 """Configuration loaded from environment variables."""
 
 import os
+from dataclasses import dataclass
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -8,38 +9,60 @@ from dotenv import load_dotenv
 load_dotenv()
 
 
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "false").lower() == "true"
+
+
+@dataclass(frozen=True, slots=True)
 class Config:
-    """Application configuration."""
+    """Application configuration (read once at startup, immutable)."""
     
     # Moltbook API
-    MOLTBOOK_API_KEY: str = os.getenv("MOLTBOOK_API_KEY", "")
-    MOLTBOOK_BASE_URL: str = "https://www.moltbook.com/api/v1"
+    MOLTBOOK_API_KEY: str
+    MOLTBOOK_BASE_URL: str
     
     # Database
-    DATABASE_PATH: Path = Path(os.getenv("DATABASE_PATH", "./data/observatory.db"))
+    DATABASE_PATH: Path
     
     # Polling intervals (in seconds)
-    POLL_POSTS_INTERVAL: int = int(os.getenv("POLL_POSTS_INTERVAL", "120"))
-    POLL_AGENTS_INTERVAL: int = int(os.getenv("POLL_AGENTS_INTERVAL", "900"))
-    POLL_SUBMOLTS_INTERVAL: int = int(os.getenv("POLL_SUBMOLTS_INTERVAL", "3600"))
+    POLL_POSTS_INTERVAL: int
+    POLL_AGENTS_INTERVAL: int
+    POLL_SUBMOLTS_INTERVAL: int
     
     # App settings
-    DEBUG: bool = os.getenv("DEBUG", "false").lower() == "true"
-    DISABLE_POLL: bool = os.getenv("DISABLE_POLL", "false").lower() == "true"
+    DEBUG: bool
+    DISABLE_POLL: bool
     
     # Footer
-    FOOTER_COPYRIGHT_HTML: str = os.getenv("FOOTER_COPYRIGHT_HTML", 'Maintained by <a href="https://simula.no" class="text-ocean-400 hover:text-ocean-300">Simula</a></span>')
+    FOOTER_COPYRIGHT_HTML: str
     
-    @classmethod
-    def validate(cls) -> None:
+    def validate(self) -> None:
         """Validate required configuration."""
-        if not cls.MOLTBOOK_API_KEY:
+        if not self.MOLTBOOK_API_KEY:
             raise ValueError("MOLTBOOK_API_KEY environment variable is required")
     
-    @classmethod
-    def ensure_data_dir(cls) -> None:
+    def ensure_data_dir(self) -> None:
         """Ensure the data directory exists."""
-        cls.DATABASE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        self.DATABASE_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+
+def load_config() -> Config:
+    """Build the configuration from the environment."""
+    return Config(
+        MOLTBOOK_API_KEY=os.getenv("MOLTBOOK_API_KEY", ""),
+        MOLTBOOK_BASE_URL="https://www.moltbook.com/api/v1",
+        DATABASE_PATH=Path(os.getenv("DATABASE_PATH", "./data/observatory.db")),
+        POLL_POSTS_INTERVAL=int(os.getenv("POLL_POSTS_INTERVAL", "120")),
+        POLL_AGENTS_INTERVAL=int(os.getenv("POLL_AGENTS_INTERVAL", "900")),
+        POLL_SUBMOLTS_INTERVAL=int(os.getenv("POLL_SUBMOLTS_INTERVAL", "3600")),
+        DEBUG=_env_flag("DEBUG"),
+        DISABLE_POLL=_env_flag("DISABLE_POLL"),
+        FOOTER_COPYRIGHT_HTML=os.getenv("FOOTER_COPYRIGHT_HTML", 'Maintained by <a href="https://simula.no" class="text-ocean-400 hover:text-ocean-300">Simula</a></span>'),
+    )
+
 
+config = load_config()
 
-config = Config()
+# Module-level aliases for the values read on every API call
+MOLTBOOK_API_KEY = config.MOLTBOOK_API_KEY
+MOLTBOOK_BASE_URL = config.MOLTBOOK_BASE_URL
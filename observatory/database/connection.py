@@ -1,5 +1,8 @@
 """Database connection handling."""
 
+import asyncio
+import os
+from contextlib import asynccontextmanager
 import aiosqlite
 from observatory.config import config
 
@@ -7,59 +10,161 @@ from observatory.config import config
 # Global write connection (shared by poller/writer)
 _db: aiosqlite.Connection | None = None
 
+# Serializes transaction() blocks: the write connection is shared, so two
+# coroutines must not interleave statements inside one transaction.
+_write_lock = asyncio.Lock()
+
+# Persistent read-only connections, checked out one query at a time. Each
+# aiosqlite connection runs on its own thread, so WAL lets them read in
+# parallel with each other and with the writer.
+READER_POOL_SIZE = min(8, (os.cpu_count() or 1) * 2)
+_readers: list[aiosqlite.Connection] = []
+_idle_readers: asyncio.Queue | None = None
+_readers_lock = asyncio.Lock()
+
 
 async def get_db() -> aiosqlite.Connection:
     """Get the shared write connection, creating it if necessary."""
     global _db
     if _db is None:
         config.ensure_data_dir()
-        _db = await aiosqlite.connect(config.DATABASE_PATH)
+        # Autocommit mode: transactions are opened explicitly by transaction().
+        # A larger statement cache keeps every poller statement prepared.
+        _db = await aiosqlite.connect(
+            config.DATABASE_PATH, isolation_level=None, cached_statements=256
+        )
         _db.row_factory = aiosqlite.Row
         await _db.execute("PRAGMA foreign_keys = ON")
         await _db.execute("PRAGMA journal_mode = WAL")
         await _db.execute("PRAGMA synchronous = NORMAL")
-        await _db.execute("PRAGMA cache_size = -64000")  # 64MB cache
+        await _db.execute("PRAGMA cache_size = -65536")  # 64MB cache
         await _db.execute("PRAGMA temp_store = MEMORY")
-        await _db.execute("PRAGMA mmap_size = 30000000")  # 30MB mmap
+        await _db.execute("PRAGMA mmap_size = 268435456")  # 256MB mmap
         await _db.execute("PRAGMA page_size = 4096")
     return _db
 
 
+async def _open_reader() -> aiosqlite.Connection:
+    """Open a read-only connection to the database."""
+    db_uri = f"file:{config.DATABASE_PATH}?mode=ro"
+    # Route queries are a fixed set of statement texts; keep them all prepared
+    db = await aiosqlite.connect(db_uri, uri=True, cached_statements=256)
+    # No row_factory on purpose: readers return plain tuples and
+    # execute_query zips them with the column names itself
+    await db.execute("PRAGMA query_only = ON")
+    await db.execute("PRAGMA cache_size = -16000")  # 16MB cache
+    await db.execute("PRAGMA temp_store = MEMORY")
+    await db.execute("PRAGMA mmap_size = 268435456")  # 256MB mmap
+    return db
+
+
+@asynccontextmanager
+async def _reader():
+    """Check a pooled read connection out for the block, opening the pool if necessary.
+
+    A query never shares a connection with another in-flight query: when
+    all readers are busy, the caller waits for one to come back.
+    """
+    global _idle_readers
+    if _idle_readers is None:
+        async with _readers_lock:
+            if _idle_readers is None:
+                readers = await asyncio.gather(
+                    *(_open_reader() for _ in range(READER_POOL_SIZE))
+                )
+                _readers.extend(readers)
+                idle = asyncio.Queue()
+                for db in readers:
+                    idle.put_nowait(db)
+                _idle_readers = idle
+    idle = _idle_readers
+    db = await idle.get()
+    try:
+        yield db
+    finally:
+        idle.put_nowait(db)
+
+
 async def close_db() -> None:
-    """Close the write connection."""
-    global _db
+    """Close the write connection and the read pool."""
+    global _db, _idle_readers
+    _idle_readers = None
+    while _readers:
+        await _readers.pop().close()
     if _db is not None:
         await _db.close()
         _db = None
 
 
 async def execute_query(query: str, params: tuple = ()) -> list[dict]:
-    """Execute a read-only query using a short-lived read-only connection.
+    """Execute a read-only query on a pooled read-only connection.
 
-    Opens a separate connection so WAL-mode concurrent reads are never
-    blocked by an in-progress write transaction on the shared write connection.
+    Reads never go through the shared write connection, so WAL-mode reads
+    are not blocked by an in-progress write transaction.
     """
-    db_uri = f"file:{config.DATABASE_PATH}?mode=ro"
-    async with aiosqlite.connect(db_uri, uri=True) as db:
-        db.row_factory = aiosqlite.Row
-        await db.execute("PRAGMA journal_mode = WAL")
-        await db.execute("PRAGMA cache_size = -16000")  # 16MB cache
-        await db.execute("PRAGMA temp_store = MEMORY")
+    async with _reader() as db:
         async with db.execute(query, params) as cursor:
             rows = await cursor.fetchall()
-            return [dict(row) for row in rows]
+            columns = [c[0] for c in cursor.description]
+    # One zip per row instead of a key lookup per column through sqlite3.Row
+    return [dict(zip(columns, row)) for row in rows]
 
 
-async def execute_insert(query: str, params: tuple = ()) -> int:
-    """Execute an insert and return the last row id."""
+async def execute_scalar(query: str, params: tuple = ()):
+    """Execute a read-only query and return the first column of its first row.
+
+    For COUNT(*)-style lookups: skips building a dict per row.
+    """
+    async with _reader() as db:
+        async with db.execute(query, params) as cursor:
+            row = await cursor.fetchone()
+    return row[0] if row else None
+
+
+async def execute_iter(query: str, params: tuple = (), batch_size: int = 1000):
+    """Execute a read-only query and yield its rows in batches.
+
+    For full-table exports: rows are fetched batch_size at a time on a
+    dedicated read-only connection, so memory stays O(batch) and a long
+    stream never holds up the pooled readers. Rows are plain tuples in
+    column order.
+    """
+    db = await _open_reader()
+    try:
+        async with db.execute(query, params) as cursor:
+            while rows := await cursor.fetchmany(batch_size):
+                yield rows
+    finally:
+        await db.close()
+
+
+@asynccontextmanager
+async def transaction():
+    """Run a block of writes as one BEGIN IMMEDIATE ... COMMIT transaction.
+
+    Yields the shared write connection. The write lock is taken up front
+    (BEGIN IMMEDIATE) so the transaction never has to upgrade from a
+    read lock; the block is rolled back if it raises.
+    """
     db = await get_db()
-    async with db.execute(query, params) as cursor:
+    async with _write_lock:
+        await db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            await db.rollback()
+            raise
         await db.commit()
-        return cursor.lastrowid
+
+
+async def execute_insert(query: str, params: tuple = ()) -> int:
+    """Execute an insert and return the last row id."""
+    async with transaction() as db:
+        async with db.execute(query, params) as cursor:
+            return cursor.lastrowid
 
 
 async def execute_many(query: str, params_list: list[tuple]) -> None:
     """Execute many inserts."""
-    db = await get_db()
-    await db.executemany(query, params_list)
-    await db.commit()
+    async with transaction() as db:
+        await db.executemany(query, params_list)
@@ -1,7 +1,10 @@
 """Database schema and migrations."""
 
+import logging
 from observatory.database.connection import get_db
 
+log = logging.getLogger(__name__)
+
 SCHEMA = """
 -- All agents we've ever seen
 CREATE TABLE IF NOT EXISTS agents (
@@ -32,7 +35,9 @@ CREATE TABLE IF NOT EXISTS posts (
     comment_count INTEGER DEFAULT 0,
     created_at TIMESTAMP,
     fetched_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-    is_pinned BOOLEAN DEFAULT FALSE
+    is_pinned BOOLEAN DEFAULT FALSE,
+    polarity REAL,
+    stored_comment_count INTEGER DEFAULT 0
 );
 
 -- All comments
@@ -69,6 +74,13 @@ CREATE TABLE IF NOT EXISTS follows (
     PRIMARY KEY (follower_id, following_id)
 );
 
+-- Follow edges between the agents /api/graph draws, rebuilt with each snapshot
+CREATE TABLE IF NOT EXISTS graph_snapshot (
+    follower_id TEXT,
+    following_id TEXT,
+    PRIMARY KEY (follower_id, following_id)
+);
+
 -- Hourly snapshots for time-series analysis
 CREATE TABLE IF NOT EXISTS snapshots (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -91,31 +103,171 @@ CREATE TABLE IF NOT EXISTS word_frequency (
 
 -- Create indexes for common queries
 CREATE INDEX IF NOT EXISTS idx_posts_created_at ON posts(created_at DESC);
-CREATE INDEX IF NOT EXISTS idx_posts_submolt ON posts(submolt);
+-- (submolt, created_at DESC) reads a community's latest posts in order and
+-- still serves submolt = ? counts, so the plain submolt index is dropped.
+DROP INDEX IF EXISTS idx_posts_submolt;
+CREATE INDEX IF NOT EXISTS idx_posts_submolt_created ON posts(submolt, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_posts_agent_id ON posts(agent_id);
 CREATE INDEX IF NOT EXISTS idx_posts_agent_name ON posts(agent_name);
 CREATE INDEX IF NOT EXISTS idx_posts_agent_created ON posts(agent_name, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_posts_fetched_at ON posts(fetched_at);
 CREATE INDEX IF NOT EXISTS idx_comments_post_id ON comments(post_id);
-CREATE INDEX IF NOT EXISTS idx_agents_karma ON agents(karma DESC);
-CREATE INDEX IF NOT EXISTS idx_agents_follower_count ON agents(follower_count DESC);
-CREATE INDEX IF NOT EXISTS idx_agents_name ON agents(name);
-CREATE INDEX IF NOT EXISTS idx_word_frequency_hour ON word_frequency(hour DESC);
+-- Directory sorts order by (column, name) so pages are deterministic among
+-- ties; each (column, name) index serves both directions of its sort.
+DROP INDEX IF EXISTS idx_agents_karma;
+DROP INDEX IF EXISTS idx_agents_follower_count;
+DROP INDEX IF EXISTS idx_agents_first_seen;
+CREATE INDEX IF NOT EXISTS idx_agents_karma_name ON agents(karma, name);
+CREATE INDEX IF NOT EXISTS idx_agents_follower_count_name ON agents(follower_count, name);
+CREATE INDEX IF NOT EXISTS idx_agents_first_seen_name ON agents(first_seen_at, name);
+-- agents.name is UNIQUE, so its automatic index already serves name
+-- lookups; the old explicit copy only cost an extra write per agent.
+DROP INDEX IF EXISTS idx_agents_name;
+-- (hour, word, count) covers the hour-windowed GROUP BY word SUMs used by
+-- trends; it supersedes the old hour-only index.
+DROP INDEX IF EXISTS idx_word_frequency_hour;
+CREATE INDEX IF NOT EXISTS idx_wf_hour_word_count ON word_frequency(hour, word, count);
 CREATE INDEX IF NOT EXISTS idx_word_frequency_word_hour ON word_frequency(word, hour DESC);
-CREATE INDEX IF NOT EXISTS idx_submolts_subscriber ON submolts(subscriber_count DESC);
-CREATE INDEX IF NOT EXISTS idx_submolts_post_count ON submolts(post_count DESC);
+DROP INDEX IF EXISTS idx_submolts_subscriber;
+DROP INDEX IF EXISTS idx_submolts_post_count;
+CREATE INDEX IF NOT EXISTS idx_submolts_subscriber_name ON submolts(subscriber_count, name);
+CREATE INDEX IF NOT EXISTS idx_submolts_post_count_name ON submolts(post_count, name);
 
 -- Covering indexes for aggregate queries in stats.py
-CREATE INDEX IF NOT EXISTS idx_agents_first_seen ON agents(first_seen_at DESC);
 CREATE INDEX IF NOT EXISTS idx_snapshots_timestamp ON snapshots(timestamp ASC);
 CREATE INDEX IF NOT EXISTS idx_posts_created_agent ON posts(created_at DESC, agent_name);
 CREATE INDEX IF NOT EXISTS idx_posts_agent_score ON posts(agent_name, score, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_posts_submolt_agent ON posts(submolt, agent_name, score, created_at DESC);
 """
 
+# Columns added after a table's first release:
+# (table, column, declaration, backfill SQL or None).
+# CREATE TABLE IF NOT EXISTS leaves older databases untouched, so these are
+# added with ALTER TABLE when missing, then backfilled once.
+ADDED_COLUMNS = [
+    # Sentiment scored once at ingestion (old rows: see backfill_polarity)
+    ("posts", "polarity", "REAL", None),
+    # Comments stored per post, kept current by the comments triggers
+    ("posts", "stored_comment_count", "INTEGER DEFAULT 0", """
+        UPDATE posts SET stored_comment_count =
+            (SELECT COUNT(*) FROM comments WHERE comments.post_id = posts.id)
+    """),
+]
+
+# Schema objects that reference ADDED_COLUMNS, created once they exist
+DEPENDENT_SCHEMA = """
+-- Posts still waiting for a sentiment score (see backfill_polarity)
+CREATE INDEX IF NOT EXISTS idx_posts_unscored ON posts(created_at DESC) WHERE polarity IS NULL;
+
+-- Maintain posts.stored_comment_count so poll_comments need not count comments
+CREATE TRIGGER IF NOT EXISTS comments_count_ai AFTER INSERT ON comments BEGIN
+    UPDATE posts SET stored_comment_count = stored_comment_count + 1 WHERE id = new.post_id;
+END;
+CREATE TRIGGER IF NOT EXISTS comments_count_ad AFTER DELETE ON comments BEGIN
+    UPDATE posts SET stored_comment_count = stored_comment_count - 1 WHERE id = old.post_id;
+END;
+"""
+
+# Full-text indexes: post titles and bodies for /search, agent and submolt
+# names and descriptions for the directory searches. External-content FTS5
+# tables: the base tables stay the source of truth, the triggers keep each
+# index in step with its table.
+FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS posts_fts USING fts5(
+    title, content,
+    content='posts', content_rowid='rowid',
+    tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS posts_fts_ai AFTER INSERT ON posts BEGIN
+    INSERT INTO posts_fts(rowid, title, content) VALUES (new.rowid, new.title, new.content);
+END;
+CREATE TRIGGER IF NOT EXISTS posts_fts_ad AFTER DELETE ON posts BEGIN
+    INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);
+END;
+CREATE TRIGGER IF NOT EXISTS posts_fts_au AFTER UPDATE OF title, content ON posts BEGIN
+    INSERT INTO posts_fts(posts_fts, rowid, title, content) VALUES ('delete', old.rowid, old.title, old.content);
+    INSERT INTO posts_fts(rowid, title, content) VALUES (new.rowid, new.title, new.content);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS agents_fts USING fts5(
+    name, description,
+    content='agents', content_rowid='rowid',
+    tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS agents_fts_ai AFTER INSERT ON agents BEGIN
+    INSERT INTO agents_fts(rowid, name, description) VALUES (new.rowid, new.name, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS agents_fts_ad AFTER DELETE ON agents BEGIN
+    INSERT INTO agents_fts(agents_fts, rowid, name, description) VALUES ('delete', old.rowid, old.name, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS agents_fts_au AFTER UPDATE OF name, description ON agents BEGIN
+    INSERT INTO agents_fts(agents_fts, rowid, name, description) VALUES ('delete', old.rowid, old.name, old.description);
+    INSERT INTO agents_fts(rowid, name, description) VALUES (new.rowid, new.name, new.description);
+END;
+
+CREATE VIRTUAL TABLE IF NOT EXISTS submolts_fts USING fts5(
+    name, display_name, description,
+    content='submolts', content_rowid='rowid',
+    tokenize='porter unicode61'
+);
+
+CREATE TRIGGER IF NOT EXISTS submolts_fts_ai AFTER INSERT ON submolts BEGIN
+    INSERT INTO submolts_fts(rowid, name, display_name, description)
+    VALUES (new.rowid, new.name, new.display_name, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS submolts_fts_ad AFTER DELETE ON submolts BEGIN
+    INSERT INTO submolts_fts(submolts_fts, rowid, name, display_name, description)
+    VALUES ('delete', old.rowid, old.name, old.display_name, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS submolts_fts_au AFTER UPDATE OF name, display_name, description ON submolts BEGIN
+    INSERT INTO submolts_fts(submolts_fts, rowid, name, display_name, description)
+    VALUES ('delete', old.rowid, old.name, old.display_name, old.description);
+    INSERT INTO submolts_fts(rowid, name, display_name, description)
+    VALUES (new.rowid, new.name, new.display_name, new.description);
+END;
+"""
+
+FTS_TABLES = ("posts_fts", "agents_fts", "submolts_fts")
+
+
+async def _add_missing_columns(db) -> None:
+    """Add any ADDED_COLUMNS that an existing database predates."""
+    for table, column, declaration, backfill in ADDED_COLUMNS:
+        async with db.execute(f"PRAGMA table_info({table})") as cursor:
+            existing = {row["name"] for row in await cursor.fetchall()}
+        if column not in existing:
+            await db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+            if backfill:
+                await db.execute(backfill)
+
+
+async def _create_fts(db) -> None:
+    """Create the full-text indexes, building any new one from its table's rows."""
+    placeholders = ",".join("?" * len(FTS_TABLES))
+    async with db.execute(
+        f"SELECT name FROM sqlite_master WHERE name IN ({placeholders})", FTS_TABLES
+    ) as cursor:
+        existing = {row["name"] for row in await cursor.fetchall()}
+    await db.executescript(FTS_SCHEMA)
+    for table in FTS_TABLES:
+        if table not in existing:
+            await db.execute(f"INSERT INTO {table}({table}) VALUES ('rebuild')")
+
 
 async def init_db() -> None:
     """Initialize the database schema."""
     db = await get_db()
     await db.executescript(SCHEMA)
-    await db.commit()
-    print("Database initialized successfully")
+    await _add_missing_columns(db)
+    # Older ingestion stored an API null as a NULL count, which the
+    # /api/submolts keyset comparison never matches
+    await db.execute("UPDATE submolts SET subscriber_count = 0 WHERE subscriber_count IS NULL")
+    await db.executescript(DEPENDENT_SCHEMA)
+    await _create_fts(db)
+    # Refresh planner statistics (sqlite_stat1) on a bounded sample so the
+    # composite indexes get picked over plain ones on a large database.
+    await db.execute("PRAGMA analysis_limit=400")
+    await db.execute("ANALYZE")
+    log.info("Database initialized successfully")
@@ -0,0 +1,46 @@
+"""Logging setup: records are queued and written on a background thread."""
+
+import logging
+import logging.handlers
+import queue
+import sys
+
+from observatory.config import config
+
+_listener: logging.handlers.QueueListener | None = None
+_queue_handler: logging.handlers.QueueHandler | None = None
+
+
+def setup_logging() -> None:
+    """Send the "observatory" loggers through a queue drained off the event loop.
+
+    Coroutines only enqueue records; a QueueListener thread formats them and
+    does the (possibly blocking) stdout write.
+    """
+    global _listener, _queue_handler
+    if _listener is not None:
+        return
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter("[%(asctime)s] %(message)s"))
+
+    log_queue = queue.SimpleQueue()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    _listener = logging.handlers.QueueListener(log_queue, stream)
+    _listener.start()
+
+    logger = logging.getLogger("observatory")
+    logger.addHandler(_queue_handler)
+    logger.setLevel(logging.DEBUG if config.DEBUG else logging.INFO)
+    logger.propagate = False
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the background writer."""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    logging.getLogger("observatory").removeHandler(_queue_handler)
+    _listener.stop()
+    _listener = None
+    _queue_handler = None
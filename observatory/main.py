@@ -1,22 +1,29 @@
 """FastAPI application entry point."""
 
+import logging
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 
 from observatory.config import config
+from observatory.log import setup_logging, stop_logging
 from observatory.database import init_db, close_db
 from observatory.poller.client import close_client
 from observatory.poller.scheduler import setup_scheduler, run_initial_poll
 from observatory.web.routes import router
+from observatory.web.etag import conditional_get
+from observatory.web.compression import GZIP_MINIMUM_SIZE, SelectiveGZipMiddleware
+
+log = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan manager."""
     # Startup
-    print("🔭 Starting Moltbook Observatory...")
+    setup_logging()
+    log.info("🔭 Starting Moltbook Observatory...")
     
     # Validate config
     config.validate()
@@ -26,11 +33,11 @@ async def lifespan(app: FastAPI):
     
     # Set up and start scheduler (unless disabled)
     if config.DISABLE_POLL:
-        print("⏸️  Polling is disabled")
+        log.info("⏸️  Polling is disabled")
     else:
         scheduler = setup_scheduler()
         scheduler.start()
-        print("📡 Background scheduler started")
+        log.info("📡 Background scheduler started")
         
         # Run initial data fetch
         await run_initial_poll()
@@ -38,12 +45,13 @@ async def lifespan(app: FastAPI):
     yield
     
     # Shutdown
-    print("Shutting down...")
+    log.info("Shutting down...")
     if not config.DISABLE_POLL:
         scheduler.shutdown()
     await close_client()
     await close_db()
-    print("Goodbye! 🦞")
+    log.info("Goodbye! 🦞")
+    stop_logging()
 
 
 # Create FastAPI app
@@ -62,6 +70,13 @@ app.mount("/static", StaticFiles(directory=str(static_path)), name="static")
 # Include routes
 app.include_router(router)
 
+# Answer repeat page/API requests with 304 while the body is unchanged.
+# Registered before GZip, so it sits inside it and hashes identity bodies.
+app.middleware("http")(conditional_get)
+
+# Compress pages and JSON (CSV exports gzip themselves; the database file is sent raw)
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=GZIP_MINIMUM_SIZE, compresslevel=6)
+
 
 if __name__ == "__main__":
     import uvicorn
@@ -1,19 +1,28 @@
 """Moltbook API client - read-only access to public data."""
 
 import httpx
+import orjson  # decodes response bytes directly; faster than response.json()
 from typing import Optional
-from observatory.config import config
+from observatory.config import MOLTBOOK_API_KEY, MOLTBOOK_BASE_URL
 
 
 class MoltbookClient:
     """Async client for the Moltbook API."""
     
     def __init__(self):
+        # One long-lived HTTP/2 client: concurrent polls multiplex over a
+        # single TLS session instead of handshaking per request.
         self.client = httpx.AsyncClient(
-            base_url=config.MOLTBOOK_BASE_URL,
-            timeout=30.0,
+            base_url=MOLTBOOK_BASE_URL,
+            http2=True,
+            timeout=httpx.Timeout(30.0, connect=5.0),
+            limits=httpx.Limits(
+                max_keepalive_connections=20,
+                max_connections=20,
+                keepalive_expiry=60,
+            ),
             headers={
-                "Authorization": f"Bearer {config.MOLTBOOK_API_KEY}",
+                "Authorization": f"Bearer {MOLTBOOK_API_KEY}",
             }
         )
     
@@ -44,13 +53,13 @@ class MoltbookClient:
         
         response = await self.client.get("/posts", params=params)
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     async def get_post(self, post_id: str) -> dict:
         """Fetch a single post by ID."""
         response = await self.client.get(f"/posts/{post_id}")
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     async def get_post_comments(
         self,
@@ -69,19 +78,19 @@ class MoltbookClient:
             params={"sort": sort}
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     async def get_submolts(self) -> dict:
         """List all submolts."""
         response = await self.client.get("/submolts")
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     async def get_submolt(self, name: str) -> dict:
         """Get info about a specific submolt."""
         response = await self.client.get(f"/submolts/{name}")
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     async def get_agent_profile(self, name: str) -> dict:
         """
@@ -91,7 +100,7 @@ class MoltbookClient:
         """
         response = await self.client.get("/agents/profile", params={"name": name})
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     async def search(self, query: str, limit: int = 25) -> dict:
         """
@@ -104,13 +113,13 @@ class MoltbookClient:
             params={"q": query, "limit": limit}
         )
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
     
     async def get_my_profile(self) -> dict:
         """Get the observatory agent's own profile (for testing connection)."""
         response = await self.client.get("/agents/me")
         response.raise_for_status()
-        return response.json()
+        return orjson.loads(response.content)
 
 
 # Global client instance
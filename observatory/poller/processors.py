@@ -1,7 +1,151 @@
 """Process API responses into database records."""
 
+import asyncio
+import logging
+import time
+from collections import deque
+from functools import lru_cache
 from datetime import datetime
-from observatory.database.connection import get_db
+from observatory.database.connection import get_db, transaction
+from observatory.poller.client import get_client
+from observatory.cache import invalidate
+from observatory.analyzer.sentiment import analyze_sentiment
+
+log = logging.getLogger(__name__)
+
+# SQLite's historical limit on bound parameters per statement
+MAX_BOUND_PARAMS = 999
+
+# Keys bound per "IN (...)" existence probe
+IN_CHUNK_SIZE = 500
+
+# Agent profile requests in flight at once in process_agents
+PROFILE_FETCH_CONCURRENCY = 8
+
+# Authors recently confirmed by ensure_agents: name -> (agent id, monotonic
+# time). Their last_seen_at is refreshed at most once per TTL.
+AGENT_SEEN_TTL = 600  # 10 minutes
+AGENT_SEEN_MAX = 10_000
+_agent_seen: dict[str, tuple[str, float]] = {}
+
+# Statement text, defined once so every call hands the connection's
+# statement cache the same string.
+_FIND_AGENT_SQL = """
+    SELECT id FROM agents
+    WHERE id = ?1 OR name = ?2
+    ORDER BY id = ?1 DESC
+    LIMIT 1
+"""
+
+_POST_INSERT_SQL = "INSERT INTO posts (id, agent_id, agent_name, submolt, title, content, url, score, comment_count, created_at, fetched_at, is_pinned, polarity)"
+
+_POST_CONFLICT_SQL = """ON CONFLICT (id) DO UPDATE SET
+    score = excluded.score,
+    comment_count = excluded.comment_count,
+    is_pinned = excluded.is_pinned
+WHERE posts.score IS NOT excluded.score
+OR posts.comment_count IS NOT excluded.comment_count
+OR posts.is_pinned IS NOT excluded.is_pinned"""
+
+_AGENT_INSERT_SQL = "INSERT INTO agents (id, name, description, karma, follower_count, following_count, is_claimed, first_seen_at, last_seen_at)"
+
+_AGENT_TOUCH_SQL = "UPDATE agents SET last_seen_at = ? WHERE id = ?"
+
+_AGENT_PROFILE_UPDATE_SQL = """
+    UPDATE agents SET
+        description = ?,
+        karma = ?,
+        follower_count = ?,
+        following_count = ?,
+        is_claimed = ?,
+        owner_x_handle = ?,
+        last_seen_at = ?,
+        created_at = ?,
+        avatar_url = ?
+    WHERE id = ?
+"""
+
+_AGENT_PROFILE_INSERT_SQL = """
+    INSERT INTO agents (id, name, description, karma, follower_count, following_count, is_claimed, owner_x_handle, first_seen_at, last_seen_at, created_at, avatar_url)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SUBMOLT_INSERT_SQL = "INSERT INTO submolts (name, display_name, description, subscriber_count, post_count, created_at, first_seen_at, avatar_url, banner_url)"
+
+# created_at and first_seen_at keep the values from the first sighting
+_SUBMOLT_CONFLICT_SQL = """ON CONFLICT (name) DO UPDATE SET
+    display_name = excluded.display_name,
+    description = excluded.description,
+    subscriber_count = excluded.subscriber_count,
+    post_count = excluded.post_count,
+    avatar_url = excluded.avatar_url,
+    banner_url = excluded.banner_url"""
+
+_COMMENT_INSERT_SQL = "INSERT INTO comments (id, post_id, agent_id, agent_name, parent_id, content, score, created_at, fetched_at)"
+
+# Existing comments are never rewritten
+_COMMENT_CONFLICT_SQL = "ON CONFLICT (id) DO NOTHING"
+
+
+async def _existing_keys(db, table: str, column: str, keys: list) -> set:
+    """Return the subset of keys already present in table.column.
+
+    One SELECT per IN_CHUNK_SIZE keys instead of one per record.
+    """
+    found = set()
+    for i in range(0, len(keys), IN_CHUNK_SIZE):
+        chunk = keys[i:i + IN_CHUNK_SIZE]
+        placeholders = ",".join("?" * len(chunk))
+        async with db.execute(
+            f"SELECT {column} FROM {table} WHERE {column} IN ({placeholders})", chunk
+        ) as cursor:
+            found.update(row[0] for row in await cursor.fetchall())
+    return found
+
+
+@lru_cache(maxsize=64)
+def _multi_row_sql(insert_sql: str, ncols: int, nrows: int, conflict_sql: str) -> str:
+    """Build (once per shape) the text of an nrows-row INSERT statement."""
+    group = "(" + ",".join("?" * ncols) + ")"
+    return f"{insert_sql} VALUES {','.join([group] * nrows)} {conflict_sql}"
+
+
+async def _insert_rows(db, insert_sql: str, rows: list[tuple], conflict_sql: str = "") -> None:
+    """Write rows as multi-row ``INSERT ... VALUES (...), (...)`` statements.
+
+    insert_sql is everything before VALUES, conflict_sql an optional
+    ON CONFLICT clause. Rows are chunked so each statement binds at most
+    MAX_BOUND_PARAMS values; full chunks share one statement text.
+    """
+    if not rows:
+        return
+    ncols = len(rows[0])
+    rows_per_statement = MAX_BOUND_PARAMS // ncols
+    for i in range(0, len(rows), rows_per_statement):
+        chunk = rows[i:i + rows_per_statement]
+        await db.execute(
+            _multi_row_sql(insert_sql, ncols, len(chunk), conflict_sql),
+            [value for row in chunk for value in row],
+        )
+
+
+async def _find_agent_id(db, agent_id: str, name: str) -> str | None:
+    """Return the stored id of an agent matched by id, else by name.
+
+    One query for both probes: an id match sorts ahead of a name match.
+    """
+    async with db.execute(_FIND_AGENT_SQL, (agent_id, name)) as cursor:
+        row = await cursor.fetchone()
+    return row[0] if row else None
+
+
+def _author(record: dict) -> tuple[str, dict]:
+    """Return (author name, author data) of a post or comment."""
+    # API uses "author" not "agent"
+    author = record.get("author") or record.get("agent") or {}
+    if isinstance(author, str):
+        author = {"name": author}
+    return (author.get("name", "") if author else ""), author
 
 
 async def process_posts(posts_data: dict) -> int:
@@ -10,124 +154,186 @@ async def process_posts(posts_data: dict) -> int:
     
     Returns number of new posts inserted.
     """
-    db = await get_db()
     posts = posts_data.get("posts", [])
     if not posts:
         return 0
     
-    new_count = 0
-    now = datetime.utcnow().isoformat()
-    
-    for post in posts:
-        post_id = post.get("id")
-        if not post_id:
-            continue
+    async with transaction() as db:
+        posts = [post for post in posts if post.get("id")]
+        now = datetime.utcnow().isoformat()
         
-        # Calculate score from upvotes/downvotes
-        upvotes = post.get("upvotes", 0) or 0
-        downvotes = post.get("downvotes", 0) or 0
-        score = upvotes - downvotes
+        # One existence probe for the whole batch: only new posts need their
+        # author resolved and their sentiment scored.
+        existing = await _existing_keys(db, "posts", "id", [post["id"] for post in posts])
         
-        # Check if post exists
-        async with db.execute("SELECT id FROM posts WHERE id = ?", (post_id,)) as cursor:
-            exists = await cursor.fetchone()
+        # First sighting of each new id is an insert; a repeat of it later
+        # in the batch is an update.
+        is_new = []
+        for post in posts:
+            is_new.append(post["id"] not in existing)
+            existing.add(post["id"])
         
-        if exists:
-            # Update existing post (score might have changed)
-            await db.execute("""
-                UPDATE posts SET
-                    score = ?,
-                    comment_count = ?,
-                    is_pinned = ?
-                WHERE id = ?
-            """, (
-                score,
-                post.get("comment_count", 0) or 0,
-                post.get("is_pinned", False),
-                post_id,
-            ))
-        else:
-            # Get author info - API uses "author" not "agent"
-            author = post.get("author") or post.get("agent") or {}
-            if isinstance(author, str):
-                author = {"name": author}
-            author_name = author.get("name", "") if author else ""
+        # Ensure authors exist BEFORE inserting posts (for foreign key
+        # constraint), each unique author once for the whole batch
+        authors = {}
+        for post, new in zip(posts, is_new):
+            author_name, author = _author(post) if new else ("", None)
+            if author_name:
+                authors.setdefault(author_name, author)
+        agent_ids = await ensure_agents(authors, now)
+        
+        rows = []
+        for post, new in zip(posts, is_new):
+            post_id = post["id"]
+            
+            # Calculate score from upvotes/downvotes
+            upvotes = post.get("upvotes", 0) or 0
+            downvotes = post.get("downvotes", 0) or 0
+            score = upvotes - downvotes
+            
+            author_name, author = _author(post)
             
             # Handle submolt being a dict or string
             submolt = post.get("submolt", "")
             if isinstance(submolt, dict):
                 submolt = submolt.get("name", "")
             
-            # Ensure agent exists BEFORE inserting post (for foreign key constraint)
+            title = post.get("title", "") or ""
+            content = post.get("content", "") or ""
+            
             resolved_agent_id = None
-            if author_name:
-                resolved_agent_id = await ensure_agent(author_name, author if isinstance(author, dict) else None)
+            polarity = None
+            if new:
+                resolved_agent_id = agent_ids.get(author_name)
+                
+                # Score sentiment once here so readers can aggregate it in SQL
+                text = f"{title} {content}".strip()
+                polarity = analyze_sentiment(text) if text else None
             
-            await db.execute("""
-                INSERT INTO posts (id, agent_id, agent_name, submolt, title, content, url, score, comment_count, created_at, fetched_at, is_pinned)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
+            rows.append((
                 post_id,
                 resolved_agent_id,
                 author_name,
                 submolt,
-                post.get("title", "") or "",
-                post.get("content", "") or "",
+                title,
+                content,
                 post.get("url"),
                 score,
                 post.get("comment_count", 0) or 0,
                 post.get("created_at"),
                 now,
                 post.get("is_pinned", False),
+                polarity,
             ))
-            new_count += 1
+        
+        # One UPSERT: new posts are inserted, known ones only refresh the
+        # fields that change (score might have changed). Rows whose values
+        # are unchanged are left alone, so no page is dirtied for them.
+        await _insert_rows(db, _POST_INSERT_SQL, rows, _POST_CONFLICT_SQL)
     
-    await db.commit()
+    new_count = sum(is_new)
+    if new_count:
+        # Stats and sentiment memoized by the analyzer are now stale.
+        invalidate("posts")
     return new_count
 
 
-async def ensure_agent(name: str, agent_data: dict = None) -> str:
-    """Ensure an agent exists in the database and return canonical agent id."""
-    db = await get_db()
-    now = datetime.utcnow().isoformat()
-    candidate_id = (agent_data or {}).get("id") or name
+async def ensure_agents(authors: dict[str, dict | None], now: str | None = None) -> dict[str, str]:
+    """Ensure a batch of agents exists and return {name: canonical agent id}.
 
-    # Check by id first, then name to avoid duplicate-id inserts.
-    async with db.execute("SELECT id FROM agents WHERE id = ?", (candidate_id,)) as cursor:
-        existing = await cursor.fetchone()
+    authors maps each author name to its API data, used only when the
+    agent is new. Agents are matched by id first, then by name, as in
+    ensure_agent, but the whole batch costs one lookup per IN_CHUNK_SIZE
+    authors, one last_seen_at executemany, and one multi-row insert.
 
-    if not existing:
-        async with db.execute("SELECT id FROM agents WHERE name = ?", (name,)) as cursor:
-            existing = await cursor.fetchone()
+    Does not commit: call it inside the caller's transaction(), which
+    commits the agents together with the rows that reference them.
+
+    Authors confirmed present within AGENT_SEEN_TTL are answered from
+    memory, without touching the database.
+    """
+    resolved = {}
+    pending = {}
+    seen_before = time.monotonic() - AGENT_SEEN_TTL
+    for name, data in authors.items():
+        seen = _agent_seen.get(name)
+        if seen and seen[1] > seen_before:
+            resolved[name] = seen[0]
+        else:
+            pending[name] = data
+    if not pending:
+        return resolved
     
-    if existing:
-        await db.execute("UPDATE agents SET last_seen_at = ? WHERE id = ?", (now, existing["id"]))
-        resolved_id = existing["id"]
-    else:
-        await db.execute("""
-            INSERT INTO agents (id, name, description, karma, follower_count, following_count, is_claimed, first_seen_at, last_seen_at)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            candidate_id,
-            name,
-            agent_data.get("description", "") if agent_data else "",
-            agent_data.get("karma", 0) if agent_data else 0,
-            agent_data.get("follower_count", 0) if agent_data else 0,
-            agent_data.get("following_count", 0) if agent_data else 0,
-            agent_data.get("is_claimed", False) if agent_data else False,
-            now,
-            now,
-        ))
-        resolved_id = candidate_id
+    db = await get_db()
+    if now is None:
+        now = datetime.utcnow().isoformat()
+    candidate_ids = {name: (data or {}).get("id") or name for name, data in pending.items()}
+    
+    known_ids = await _existing_keys(db, "agents", "id", list(set(candidate_ids.values())))
+    known_names = {}
+    names = list(pending)
+    for i in range(0, len(names), IN_CHUNK_SIZE):
+        chunk = names[i:i + IN_CHUNK_SIZE]
+        placeholders = ",".join("?" * len(chunk))
+        async with db.execute(
+            f"SELECT name, id FROM agents WHERE name IN ({placeholders})", chunk
+        ) as cursor:
+            known_names.update(await cursor.fetchall())
+    
+    touched = []
+    insert_rows = []
+    inserted = set()
+    for name, agent_data in pending.items():
+        candidate_id = candidate_ids[name]
+        
+        # Check by id first, then name to avoid duplicate-id inserts.
+        existing_id = candidate_id if candidate_id in known_ids else known_names.get(name)
+        
+        if existing_id:
+            touched.append((now, existing_id))
+            resolved[name] = existing_id
+            # Only agents that already existed are remembered: agents are
+            # never deleted, so a rolled-back batch cannot leave a stale
+            # entry behind.
+            if existing_id not in inserted:
+                if len(_agent_seen) >= AGENT_SEEN_MAX:
+                    _agent_seen.clear()
+                _agent_seen[name] = (existing_id, time.monotonic())
+        else:
+            insert_rows.append((
+                candidate_id,
+                name,
+                agent_data.get("description", "") if agent_data else "",
+                agent_data.get("karma", 0) if agent_data else 0,
+                agent_data.get("follower_count", 0) if agent_data else 0,
+                agent_data.get("following_count", 0) if agent_data else 0,
+                agent_data.get("is_claimed", False) if agent_data else False,
+                now,
+                now,
+            ))
+            resolved[name] = candidate_id
+            # Later authors in the batch see this agent as existing
+            inserted.add(candidate_id)
+            known_ids.add(candidate_id)
+            known_names[name] = candidate_id
     
-    await db.commit()
-    return resolved_id
+    if touched:
+        await db.executemany(_AGENT_TOUCH_SQL, touched)
+    await _insert_rows(db, _AGENT_INSERT_SQL, insert_rows)
+    return resolved
+
+
+async def ensure_agent(name: str, agent_data: dict = None, now: str | None = None) -> str:
+    """Ensure an agent exists in the database and return canonical agent id.
+
+    Single-agent form of ensure_agents; same caching, and likewise does
+    not commit.
+    """
+    return (await ensure_agents({name: agent_data}, now))[name]
 
 
 async def process_agent_profile(profile_data: dict) -> None:
     """Process and store agent profile data."""
-    db = await get_db()
-    
     agent = profile_data.get("agent", {})
     if not agent:
         return
@@ -136,64 +342,43 @@ async def process_agent_profile(profile_data: dict) -> None:
     if not name:
         return
     
-    now = datetime.utcnow().isoformat()
-    owner = agent.get("owner", {})
-    
-    agent_id = agent.get("id", name)
-
-    async with db.execute("SELECT id FROM agents WHERE id = ?", (agent_id,)) as cursor:
-        exists_by_id = await cursor.fetchone()
+    async with transaction() as db:
+        now = datetime.utcnow().isoformat()
+        owner = agent.get("owner", {})
+        
+        agent_id = agent.get("id", name)
 
-    exists = exists_by_id
-    if not exists:
-        async with db.execute("SELECT id FROM agents WHERE name = ?", (name,)) as cursor:
-            exists = await cursor.fetchone()
-    
-    if exists:
-        await db.execute("""
-            UPDATE agents SET
-                description = ?,
-                karma = ?,
-                follower_count = ?,
-                following_count = ?,
-                is_claimed = ?,
-                owner_x_handle = ?,
-                last_seen_at = ?,
-                created_at = ?,
-                avatar_url = ?
-            WHERE id = ?
-        """, (
-            agent.get("description", ""),
-            agent.get("karma", 0),
-            agent.get("follower_count", 0),
-            agent.get("following_count", 0),
-            agent.get("is_claimed", False),
-            owner.get("x_handle") if owner else None,
-            now,
-            agent.get("created_at"),
-            agent.get("avatar_url"),
-            exists["id"],
-        ))
-    else:
-        await db.execute("""
-            INSERT INTO agents (id, name, description, karma, follower_count, following_count, is_claimed, owner_x_handle, first_seen_at, last_seen_at, created_at, avatar_url)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (
-            agent_id,
-            name,
-            agent.get("description", ""),
-            agent.get("karma", 0),
-            agent.get("follower_count", 0),
-            agent.get("following_count", 0),
-            agent.get("is_claimed", False),
-            owner.get("x_handle") if owner else None,
-            now,
-            now,
-            agent.get("created_at"),
-            agent.get("avatar_url"),
-        ))
-    
-    await db.commit()
+        existing_id = await _find_agent_id(db, agent_id, name)
+        
+        if existing_id:
+            await db.execute(_AGENT_PROFILE_UPDATE_SQL, (
+                agent.get("description", ""),
+                agent.get("karma", 0),
+                agent.get("follower_count", 0),
+                agent.get("following_count", 0),
+                agent.get("is_claimed", False),
+                owner.get("x_handle") if owner else None,
+                now,
+                agent.get("created_at"),
+                agent.get("avatar_url"),
+                existing_id,
+            ))
+        else:
+            await db.execute(_AGENT_PROFILE_INSERT_SQL, (
+                agent_id,
+                name,
+                agent.get("description", ""),
+                agent.get("karma", 0),
+                agent.get("follower_count", 0),
+                agent.get("following_count", 0),
+                agent.get("is_claimed", False),
+                owner.get("x_handle") if owner else None,
+                now,
+                now,
+                agent.get("created_at"),
+                agent.get("avatar_url"),
+            ))
+        
 
 
 async def process_agents(agents_list: list[str]) -> int:
@@ -202,18 +387,27 @@ async def process_agents(agents_list: list[str]) -> int:
     
     Returns number of agents updated.
     """
-    from observatory.poller.client import get_client
-    
     client = await get_client()
     updated = 0
     
-    for name in agents_list:
+    # Fetch profiles concurrently (bounded, to go easy on the API); the
+    # writes below stay sequential since they share one connection.
+    semaphore = asyncio.Semaphore(PROFILE_FETCH_CONCURRENCY)
+    
+    async def fetch(name: str) -> dict:
+        async with semaphore:
+            return await client.get_agent_profile(name)
+    
+    profiles = await asyncio.gather(*(fetch(name) for name in agents_list), return_exceptions=True)
+    
+    for name, profile in zip(agents_list, profiles):
         try:
-            profile = await client.get_agent_profile(name)
+            if isinstance(profile, BaseException):
+                raise profile
             await process_agent_profile(profile)
             updated += 1
         except Exception as e:
-            print(f"Error fetching profile for {name}: {e}")
+            log.error("Error fetching profile for %s: %s", name, e)
     
     return updated
 
@@ -224,59 +418,34 @@ async def process_submolts(submolts_data: dict) -> int:
     
     Returns number of submolts processed.
     """
-    db = await get_db()
     submolts = submolts_data.get("submolts", [])
     if not submolts:
         return 0
     
-    now = datetime.utcnow().isoformat()
-    count = 0
-    
-    for submolt in submolts:
-        name = submolt.get("name")
-        if not name:
-            continue
+    async with transaction() as db:
+        submolts = [submolt for submolt in submolts if submolt.get("name")]
+        now = datetime.utcnow().isoformat()
         
-        async with db.execute("SELECT name FROM submolts WHERE name = ?", (name,)) as cursor:
-            exists = await cursor.fetchone()
-        
-        if exists:
-            await db.execute("""
-                UPDATE submolts SET
-                    display_name = ?,
-                    description = ?,
-                    subscriber_count = ?,
-                    post_count = ?,
-                    avatar_url = ?,
-                    banner_url = ?
-                WHERE name = ?
-            """, (
-                submolt.get("display_name", name),
-                submolt.get("description", ""),
-                submolt.get("subscriber_count", 0),
-                submolt.get("post_count", 0),
-                submolt.get("avatar_url"),
-                submolt.get("banner_url"),
-                name,
-            ))
-        else:
-            await db.execute("""
-                INSERT INTO submolts (name, display_name, description, subscriber_count, post_count, created_at, first_seen_at, avatar_url, banner_url)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                name,
-                submolt.get("display_name", name),
+        rows = [
+            (
+                submolt["name"],
+                submolt.get("display_name", submolt["name"]),
                 submolt.get("description", ""),
-                submolt.get("subscriber_count", 0),
+                # The API sends null for some; keyset paging needs a number
+                submolt.get("subscriber_count") or 0,
                 submolt.get("post_count", 0),
                 submolt.get("created_at"),
                 now,
                 submolt.get("avatar_url"),
                 submolt.get("banner_url"),
-            ))
-        count += 1
-    
-    await db.commit()
+            )
+            for submolt in submolts
+        ]
+        
+        # UPSERT: no existence check needed
+        await _insert_rows(db, _SUBMOLT_INSERT_SQL, rows, _SUBMOLT_CONFLICT_SQL)
+        
+        count = len(submolts)
     return count
 
 
@@ -286,48 +455,56 @@ async def process_comments(post_id: str, comments_data: dict) -> int:
     
     Returns number of new comments inserted.
     """
-    db = await get_db()
     comments = comments_data.get("comments", [])
     if not comments:
         return 0
     
-    new_count = 0
-    now = datetime.utcnow().isoformat()
-    
-    async def process_comment(comment: dict, parent_id: str = None) -> None:
-        nonlocal new_count
-        
-        comment_id = comment.get("id")
-        if not comment_id:
-            return
-        
-        async with db.execute("SELECT id FROM comments WHERE id = ?", (comment_id,)) as cursor:
-            exists = await cursor.fetchone()
+    async with transaction() as db:
+        now = datetime.utcnow().isoformat()
         
-        # API uses "author" not "agent"
-        author = comment.get("author") or comment.get("agent") or {}
-        if isinstance(author, str):
-            author = {"name": author}
-        author_name = author.get("name", "") if author else ""
+        # Flatten the reply tree breadth-first (no recursion, so deep
+        # threads cannot hit the recursion limit) into (comment, parent_id)
+        # pairs, so existence is checked in one query. A comment without an
+        # id is skipped together with its replies, as before.
+        flat: list[tuple[dict, str | None]] = []
+        queue = deque((comment, None) for comment in comments)
+        while queue:
+            comment, parent_id = queue.popleft()
+            comment_id = comment.get("id")
+            if not comment_id:
+                continue
+            flat.append((comment, parent_id))
+            queue.extend((reply, comment_id) for reply in comment.get("replies", []))
         
-        # Calculate score from upvotes/downvotes
-        upvotes = comment.get("upvotes", 0) or 0
-        downvotes = comment.get("downvotes", 0) or 0
-        score = upvotes - downvotes
+        existing = await _existing_keys(db, "comments", "id", [comment["id"] for comment, _ in flat])
+        new_comments = []
+        for comment, parent_id in flat:
+            if comment["id"] not in existing:
+                new_comments.append((comment, parent_id))
+                existing.add(comment["id"])
         
-        if not exists:
-            # Ensure agent exists BEFORE inserting comment (FK constraint)
-            resolved_agent_id = None
+        # Ensure agents exist BEFORE inserting comments (FK constraint),
+        # each unique author once for the whole thread
+        authors = {}
+        for comment, _ in new_comments:
+            author_name, author = _author(comment)
             if author_name:
-                resolved_agent_id = await ensure_agent(author_name, author)
+                authors.setdefault(author_name, author)
+        agent_ids = await ensure_agents(authors, now)
+        
+        insert_rows = []
+        for comment, parent_id in new_comments:
+            author_name, _ = _author(comment)
             
-            await db.execute("""
-                INSERT INTO comments (id, post_id, agent_id, agent_name, parent_id, content, score, created_at, fetched_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                comment_id,
+            # Calculate score from upvotes/downvotes
+            upvotes = comment.get("upvotes", 0) or 0
+            downvotes = comment.get("downvotes", 0) or 0
+            score = upvotes - downvotes
+            
+            insert_rows.append((
+                comment["id"],
                 post_id,
-                resolved_agent_id,
+                agent_ids.get(author_name),
                 author_name,
                 parent_id,
                 comment.get("content", ""),
@@ -335,14 +512,8 @@ async def process_comments(post_id: str, comments_data: dict) -> int:
                 comment.get("created_at"),
                 now,
             ))
-            new_count += 1
         
-        # Process replies
-        for reply in comment.get("replies", []):
-            await process_comment(reply, comment_id)
-    
-    for comment in comments:
-        await process_comment(comment)
-    
-    await db.commit()
+        await _insert_rows(db, _COMMENT_INSERT_SQL, insert_rows, _COMMENT_CONFLICT_SQL)
+        
+        new_count = len(insert_rows)
     return new_count
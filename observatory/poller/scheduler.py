@@ -1,54 +1,65 @@
 """Background scheduler for polling Moltbook."""
 
 import asyncio
-from datetime import datetime
+import logging
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from observatory.config import config
+from observatory.database.connection import execute_query
+from observatory.poller.client import get_client
+from observatory.poller.processors import process_posts, process_submolts, process_agents, process_comments
+from observatory.analyzer.trends import update_word_frequency
+from observatory.analyzer.sentiment import backfill_polarity
+from observatory.analyzer.stats import create_snapshot, refresh_graph_snapshot, invalidate_stats_cache
+
+log = logging.getLogger(__name__)
+
+# Comment threads fetched at once by poll_comments (API rate limits)
+COMMENT_FETCH_CONCURRENCY = 4
 
 
 async def poll_posts() -> None:
     """Fetch new posts from Moltbook."""
-    from observatory.poller.client import get_client
-    from observatory.poller.processors import process_posts
-    
     try:
         client = await get_client()
         
-        # Fetch newest posts
-        data = await client.get_posts(sort="new", limit=50)
-        new_count = await process_posts(data)
+        # Fetch newest posts, and hot posts to catch trending content, at
+        # the same time; the writes below stay sequential.
+        new_data, hot_data = await asyncio.gather(
+            client.get_posts(sort="new", limit=50),
+            client.get_posts(sort="hot", limit=25),
+            return_exceptions=True,
+        )
         
-        if new_count > 0:
-            print(f"[{datetime.now().isoformat()}] Fetched {new_count} new posts")
+        if isinstance(new_data, BaseException):
+            log.error("Error polling posts: %s", new_data)
+        else:
+            new_count = await process_posts(new_data)
+            if new_count > 0:
+                log.info("Fetched %s new posts", new_count)
         
-        # Also fetch hot posts to catch trending content
-        data = await client.get_posts(sort="hot", limit=25)
-        await process_posts(data)
+        if isinstance(hot_data, BaseException):
+            log.error("Error polling hot posts: %s", hot_data)
+        else:
+            await process_posts(hot_data)
         
     except Exception as e:
-        print(f"[{datetime.now().isoformat()}] Error polling posts: {e}")
+        log.error("Error polling posts: %s", e)
 
 
 async def poll_submolts() -> None:
     """Fetch submolt list and info."""
-    from observatory.poller.client import get_client
-    from observatory.poller.processors import process_submolts
-    
     try:
         client = await get_client()
         data = await client.get_submolts()
         count = await process_submolts(data)
-        print(f"[{datetime.now().isoformat()}] Updated {count} submolts")
+        log.info("Updated %s submolts", count)
     except Exception as e:
-        print(f"[{datetime.now().isoformat()}] Error polling submolts: {e}")
+        log.error("Error polling submolts: %s", e)
 
 
 async def poll_agents() -> None:
     """Update agent profiles for known agents."""
-    from observatory.database.connection import execute_query
-    from observatory.poller.processors import process_agents
-    
     try:
         # Get agents we haven't updated recently
         agents = await execute_query("""
@@ -60,37 +71,27 @@ async def poll_agents() -> None:
         agent_names = [a["name"] for a in agents]
         if agent_names:
             updated = await process_agents(agent_names)
-            print(f"[{datetime.now().isoformat()}] Updated {updated} agent profiles")
+            log.info("Updated %s agent profiles", updated)
     except Exception as e:
-        print(f"[{datetime.now().isoformat()}] Error polling agents: {e}")
+        log.error("Error polling agents: %s", e)
 
 
 async def poll_comments() -> None:
     """Fetch comments for posts that have comments."""
-    from observatory.database.connection import execute_query
-    from observatory.poller.client import get_client
-    from observatory.poller.processors import process_comments
-    
     try:
         # Get posts with comments that we haven't fetched comments for yet
         # Note: The Moltbook API has a ~1000 comment limit per request with no pagination
         # So we consider posts with 900+ stored comments as "complete"
         API_COMMENT_LIMIT = 900  # Slightly below 998 to account for edge cases
         
+        # stored_comment_count is maintained by triggers on comments, so
+        # this no longer aggregates the whole comments table every poll.
         posts = await execute_query("""
-            SELECT p.id, p.comment_count 
-            FROM posts p
-            LEFT JOIN (
-                SELECT post_id, COUNT(*) as stored_comments 
-                FROM comments 
-                GROUP BY post_id
-            ) c ON p.id = c.post_id
-            WHERE p.comment_count > 0 
-            AND (
-                c.stored_comments IS NULL 
-                OR (c.stored_comments < p.comment_count AND c.stored_comments < ?)
-            )
-            ORDER BY p.created_at DESC
+            SELECT id, comment_count
+            FROM posts
+            WHERE comment_count > stored_comment_count
+            AND stored_comment_count < ?
+            ORDER BY created_at DESC
             LIMIT 50
         """, (API_COMMENT_LIMIT,))
         
@@ -100,44 +101,63 @@ async def poll_comments() -> None:
         client = await get_client()
         total_new = 0
         
-        for post in posts:
+        # Fetch comments using the dedicated endpoint, a few posts at a
+        # time; storing them stays sequential on the write connection.
+        semaphore = asyncio.Semaphore(COMMENT_FETCH_CONCURRENCY)
+        
+        async def fetch(post_id: str) -> dict:
+            async with semaphore:
+                return await client.get_post_comments(post_id)
+        
+        responses = await asyncio.gather(*(fetch(post["id"]) for post in posts), return_exceptions=True)
+        
+        for post, response in zip(posts, responses):
             try:
-                # Fetch comments using the dedicated endpoint
-                response = await client.get_post_comments(post["id"])
+                if isinstance(response, BaseException):
+                    raise response
                 comments = response.get("comments", [])
                 
                 if comments:
                     new_count = await process_comments(post["id"], {"comments": comments})
                     total_new += new_count
             except Exception as e:
-                print(f"[{datetime.now().isoformat()}] Error fetching comments for post {post['id']}: {e}")
+                log.error("Error fetching comments for post %s: %s", post['id'], e)
                 
         if total_new > 0:
-            print(f"[{datetime.now().isoformat()}] Fetched {total_new} new comments")
+            log.info("Fetched %s new comments", total_new)
             
     except Exception as e:
-        print(f"[{datetime.now().isoformat()}] Error polling comments: {e}")
+        log.error("Error polling comments: %s", e)
 
 
 async def calculate_trends() -> None:
     """Calculate trending words from recent posts."""
-    from observatory.analyzer.trends import update_word_frequency
-    
     try:
         await update_word_frequency()
     except Exception as e:
-        print(f"[{datetime.now().isoformat()}] Error calculating trends: {e}")
+        log.error("Error calculating trends: %s", e)
+
+
+async def score_sentiment() -> None:
+    """Score sentiment for posts stored without a polarity."""
+    try:
+        scored = await backfill_polarity()
+        if scored > 0:
+            log.info("Scored sentiment for %s posts", scored)
+    except Exception as e:
+        log.error("Error scoring sentiment: %s", e)
 
 
 async def take_snapshot() -> None:
     """Take an hourly snapshot of platform metrics."""
-    from observatory.analyzer.stats import create_snapshot
-    
     try:
         await create_snapshot()
-        print(f"[{datetime.now().isoformat()}] Snapshot created")
+        await refresh_graph_snapshot()
+        # New snapshot row: drop cached history and hourly aggregates
+        invalidate_stats_cache()
+        log.info("Snapshot created")
     except Exception as e:
-        print(f"[{datetime.now().isoformat()}] Error taking snapshot: {e}")
+        log.error("Error taking snapshot: %s", e)
 
 
 def setup_scheduler() -> AsyncIOScheduler:
@@ -189,6 +209,15 @@ def setup_scheduler() -> AsyncIOScheduler:
         replace_existing=True,
     )
     
+    # Score posts missing a polarity every 10 minutes
+    scheduler.add_job(
+        score_sentiment,
+        IntervalTrigger(minutes=10),
+        id="score_sentiment",
+        name="Score post sentiment",
+        replace_existing=True,
+    )
+    
     # Take snapshot every hour
     scheduler.add_job(
         take_snapshot,
@@ -203,7 +232,12 @@ def setup_scheduler() -> AsyncIOScheduler:
 
 async def run_initial_poll() -> None:
     """Run an initial poll on startup."""
-    print("Running initial data fetch...")
-    await poll_submolts()
-    await poll_posts()
-    print("Initial fetch complete")
+    log.info("Running initial data fetch...")
+    # Independent endpoints; each poll catches and logs its own errors
+    await asyncio.gather(poll_submolts(), poll_posts())
+    try:
+        # Serve a graph before the first hourly snapshot
+        await refresh_graph_snapshot()
+    except Exception as e:
+        log.error("Error building graph snapshot: %s", e)
+    log.info("Initial fetch complete")
@@ -0,0 +1,46 @@
+"""Response compression."""
+
+from starlette.datastructures import Headers
+from starlette.middleware.gzip import GZipMiddleware
+
+# Served as is: the SQLite file is binary, and FileResponse's Content-Length
+# and Range support only hold for the uncompressed bytes.
+UNCOMPRESSED_PATHS = frozenset({"/api/export/database.db"})
+
+# Bodies smaller than this go out uncompressed
+GZIP_MINIMUM_SIZE = 1024
+
+
+def accepts_gzip(headers) -> bool:
+    """Whether a request's Accept-Encoding allows gzip.
+
+    Honours q-values: "gzip;q=0" refuses it, and an explicit gzip entry
+    overrides "*".
+    """
+    qualities = {}
+    for part in headers.get("accept-encoding", "").split(","):
+        coding, *params = (p.strip() for p in part.split(";"))
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[coding.lower()] = q
+    return qualities.get("gzip", qualities.get("*", 0.0)) > 0
+
+
+class SelectiveGZipMiddleware(GZipMiddleware):
+    """GZipMiddleware that skips UNCOMPRESSED_PATHS and clients refusing gzip."""
+
+    async def __call__(self, scope, receive, send) -> None:
+        # Starlette only substring-matches "gzip", which takes gzip;q=0 as
+        # consent; decide here with the q-values honoured instead.
+        if scope["type"] == "http" and (
+            scope["path"] in UNCOMPRESSED_PATHS or not accepts_gzip(Headers(scope=scope))
+        ):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
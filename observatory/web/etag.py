@@ -0,0 +1,59 @@
+"""Conditional GET: ETags derived from the response body."""
+
+import hashlib
+from fastapi import Request
+from fastapi.responses import Response
+
+from observatory.web.compression import GZIP_MINIMUM_SIZE, accepts_gzip
+
+# Downloads are streamed untouched
+_EXEMPT_PREFIXES = ("/api/export/", "/static/")
+
+# Headers a 304 must repeat from the 200 it stands in for (RFC 9110 15.4.5)
+_NOT_MODIFIED_HEADERS = ("cache-control", "content-location", "expires", "vary")
+
+
+def body_etag(body: bytes) -> str:
+    """Return the ETag for a response body."""
+    # Weak: the gzip and identity encodings of a response share the tag
+    return 'W/"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+async def conditional_get(request: Request, call_next):
+    """HTTP middleware: 304 when the client already holds this exact body.
+
+    The tag is a hash of the body the route produced, so a tag can never
+    stand for two different bodies, however long a route cache keeps its
+    data. The route still runs on a match (for the pages that see repeat
+    traffic that is a cache hit) but the body isn't sent again. Only
+    cacheable 200 responses are tagged; no-store ones (search, refresh)
+    never hand out a tag to match.
+    """
+    response = await call_next(request)
+    if (
+        request.method != "GET"
+        or request.url.path.startswith(_EXEMPT_PREFIXES)
+        or response.status_code != 200
+        or "no-store" in response.headers.get("cache-control", "")
+    ):
+        return response
+
+    body = b"".join([chunk async for chunk in response.body_iterator])
+    etag = body_etag(body)
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        headers = {"ETag": etag}
+        for name in _NOT_MODIFIED_HEADERS:
+            if name in response.headers:
+                headers[name] = response.headers[name]
+        not_modified = Response(status_code=304, headers=headers)
+        # GZip, outside this middleware, adds Vary only to bodies it
+        # compresses; an empty 304 gets past it, so repeat what the 200 had
+        if len(body) >= GZIP_MINIMUM_SIZE and accepts_gzip(request.headers):
+            not_modified.headers.add_vary_header("Accept-Encoding")
+        return not_modified
+
+    tagged = Response(body, status_code=response.status_code)
+    tagged.raw_headers = response.raw_headers
+    tagged.headers["ETag"] = etag
+    return tagged
@@ -1,28 +1,50 @@
 """FastAPI routes for the Observatory web dashboard."""
 
+import asyncio
 import csv
 import io
+import logging
+import zlib
+from email.utils import formatdate, parsedate_to_datetime
+from functools import lru_cache
 from typing import Optional
+import orjson
 from fastapi import APIRouter, Request, Query
-from fastapi.responses import HTMLResponse, StreamingResponse, FileResponse, JSONResponse
+from fastapi.responses import HTMLResponse, StreamingResponse, FileResponse, ORJSONResponse, Response
 from fastapi.templating import Jinja2Templates
+from jinja2 import FileSystemBytecodeCache
 from pathlib import Path
 
-from observatory.database.connection import execute_query
+from observatory.database.connection import execute_query, execute_scalar, execute_iter, transaction
 from observatory.analyzer.stats import (
-    get_stats, get_new_agents_today, get_snapshot_history,
-    get_top_posters, get_activity_by_hour, get_submolt_activity
+    get_stats, get_dashboard_bundle, get_new_agents_today, get_snapshot_history,
+    get_top_posters, get_activity_by_hour, get_activity_histogram, get_submolt_activity
 )
 from observatory.analyzer.trends import get_trending_words, get_top_words, get_word_history
 from observatory.analyzer.sentiment import get_recent_sentiment
 from observatory.config import config
 from observatory.cache import get_cache
+from observatory.poller.client import get_client
+from observatory.poller.processors import process_agent_profile
+from observatory.web.compression import accepts_gzip
 
-router = APIRouter()
+log = logging.getLogger(__name__)
+
+# API routes build ORJSONResponse themselves to attach Cache-Control; the
+# default covers anything that returns a plain dict and the OpenAPI schema.
+router = APIRouter(default_response_class=ORJSONResponse)
 
 # Set up templates
 templates_path = Path(__file__).parent / "templates"
 templates = Jinja2Templates(directory=str(templates_path))
+# Compiled templates persist in the temp dir across restarts, so a cold
+# worker skips parsing; outside DEBUG, renders skip the per-template stat().
+templates.env.bytecode_cache = FileSystemBytecodeCache()
+templates.env.auto_reload = config.DEBUG
+# Compile every template at import so the first request to each page
+# doesn't pay for parsing; Jinja's default 400-entry cache holds them all.
+for _name in templates.env.list_templates(extensions=["html"]):
+    templates.env.get_template(_name)
 
 # Cache-Control header values
 _CC_SHORT   = "public, max-age=30, s-maxage=60"     # live feed / index
@@ -31,30 +53,276 @@ _CC_LONG    = "public, max-age=120, s-maxage=300"   # profiles, trends, analytic
 _CC_STATIC  = "public, max-age=300, s-maxage=600"   # posts, graph (rarely change)
 _CC_NOSTORE = "no-store"                             # exports, search, refresh
 
+# Static queries. Defined once so each call passes the same text and hits
+# the connection's prepared-statement cache instead of re-preparing.
+_DASHBOARD_POSTS_SQL = """
+    SELECT id, agent_name, submolt, title, content, score, comment_count, created_at
+    FROM posts
+    ORDER BY created_at DESC
+    LIMIT 20
+"""
+_POST_COUNT_SQL = "SELECT COUNT(*) FROM posts"
+_FEED_SQL = """
+    SELECT id, agent_name, submolt, title, content, score, comment_count, created_at
+    FROM posts
+    ORDER BY created_at DESC
+    LIMIT ?
+"""
+_FEED_SINCE_SQL = """
+    SELECT id, agent_name, submolt, title, content, score, comment_count, created_at
+    FROM posts
+    WHERE created_at > ?
+    ORDER BY created_at DESC
+    LIMIT ?
+"""
+_FEED_BEFORE_SQL = """
+    SELECT id, agent_name, submolt, title, content, score, comment_count, created_at
+    FROM posts
+    WHERE created_at < ?
+    ORDER BY created_at DESC
+    LIMIT ?
+"""
+_FEED_BETWEEN_SQL = """
+    SELECT id, agent_name, submolt, title, content, score, comment_count, created_at
+    FROM posts
+    WHERE created_at > ? AND created_at < ?
+    ORDER BY created_at DESC
+    LIMIT ?
+"""
+_FEED_PAGE_SQL = """
+    SELECT id, agent_name, submolt, title, content, score, comment_count, created_at
+    FROM posts
+    ORDER BY created_at DESC
+    LIMIT ? OFFSET ?
+"""
+
+_AGENT_SQL = """
+    SELECT name, description, karma, follower_count, following_count,
+           is_claimed, owner_x_handle, first_seen_at, last_seen_at, created_at, avatar_url
+    FROM agents WHERE name = ?
+"""
+_AGENT_POST_COUNT_SQL = "SELECT COUNT(*) FROM posts WHERE agent_name = ?"
+_AGENT_POSTS_SQL = """
+    SELECT id, submolt, title, content, score, comment_count, created_at
+    FROM posts
+    WHERE agent_name = ?
+    ORDER BY created_at DESC
+    LIMIT 20
+"""
+_API_AGENT_SQL = """
+    SELECT name, description, karma, follower_count, following_count,
+           is_claimed, owner_x_handle, first_seen_at, last_seen_at, created_at
+    FROM agents WHERE name = ?
+"""
+_API_AGENT_POSTS_SQL = """
+    SELECT id, submolt, title, score, comment_count, created_at
+    FROM posts WHERE agent_name = ?
+    ORDER BY created_at DESC LIMIT 10
+"""
+
+_POST_SQL = """
+    SELECT id, agent_name, submolt, title, content, score, comment_count, created_at
+    FROM posts WHERE id = ?
+"""
+_POST_COMMENTS_SQL = """
+    SELECT id, agent_name, parent_id, content, score, created_at
+    FROM comments WHERE post_id = ?
+    ORDER BY created_at DESC LIMIT 50
+"""
+
+_SUBMOLT_SQL = """
+    SELECT name, display_name, description, subscriber_count, post_count,
+           created_at, first_seen_at, avatar_url, banner_url
+    FROM submolts WHERE name = ?
+"""
+_SUBMOLT_POST_COUNT_SQL = "SELECT COUNT(*) FROM posts WHERE submolt = ?"
+_SUBMOLT_POSTS_SQL = """
+    SELECT id, agent_name, title, content, score, comment_count, created_at
+    FROM posts WHERE submolt = ?
+    ORDER BY created_at DESC LIMIT 20
+"""
+_SUBMOLT_REFRESH_SQL = """
+    UPDATE submolts SET subscriber_count = ?, post_count = ?
+    WHERE name = ?
+"""
+# Keyset pages on (subscriber_count, name), walking idx_submolts_subscriber_name
+_API_SUBMOLTS_SQL = """
+    SELECT name, display_name, description, subscriber_count, post_count
+    FROM submolts
+    ORDER BY subscriber_count DESC, name DESC
+    LIMIT ?
+"""
+_API_SUBMOLTS_AFTER_SQL = """
+    SELECT name, display_name, description, subscriber_count, post_count
+    FROM submolts
+    WHERE (subscriber_count, name) < (?, ?)
+    ORDER BY subscriber_count DESC, name DESC
+    LIMIT ?
+"""
+
+# Graph rows are aliased to the response keys, so they serialize as is
+_GRAPH_NODES_SQL = """
+    SELECT name AS id, karma, follower_count AS followers
+    FROM agents WHERE karma > 0
+    ORDER BY karma DESC LIMIT 100
+"""
+# Edges among the nodes above, materialized by refresh_graph_snapshot()
+_GRAPH_EDGES_SQL = "SELECT follower_id AS source, following_id AS target FROM graph_snapshot"
+
+# Exports select their CSV columns in file order, with carriage returns
+# stripped from free text (char(13) is '\r') and post URLs built in SQL,
+# so rows go straight to csv.writer.
+_EXPORT_POSTS_SQL = """
+    SELECT id, agent_name, submolt,
+           REPLACE(title, char(13), '') AS title,
+           REPLACE(content, char(13), '') AS content,
+           'https://moltbook.com/post/' || id AS url,
+           score, comment_count, created_at
+    FROM posts ORDER BY created_at DESC
+"""
+_EXPORT_AGENTS_SQL = """
+    SELECT name, REPLACE(description, char(13), '') AS description,
+           karma, follower_count, following_count,
+           is_claimed, owner_x_handle, first_seen_at, created_at
+    FROM agents ORDER BY karma DESC
+"""
+_EXPORT_COMMENTS_SQL = """
+    SELECT id, post_id,
+           'https://moltbook.com/post/' || post_id AS post_url,
+           agent_name, parent_id,
+           REPLACE(content, char(13), '') AS content,
+           score, created_at
+    FROM comments ORDER BY created_at DESC
+"""
+
+
+def _fts_query(text: str) -> str:
+    """Turn free text into an FTS5 MATCH expression of prefix terms.
+
+    Every whitespace-separated token is quoted (so FTS5 operators and
+    punctuation in user input are taken literally) and suffixed with ``*``
+    so partial words still match, e.g. ``crypto wal`` ->
+    ``"crypto"* "wal"*``.
+    """
+    return " ".join('"' + token.replace('"', '""') + '"*' for token in text.split())
+
+
+def _order_by(sort: str, direction: str) -> str:
+    """ORDER BY terms for a directory sort.
+
+    name breaks ties so rows never shift between pages; the (sort, name)
+    indexes serve either direction.
+    """
+    return f"{sort} {direction}" if sort == "name" else f"{sort} {direction}, name {direction}"
+
+
+# Directory listings: every (sort, direction, searching) variant is built
+# once here, so sort and search options never produce new statement text.
+# Searches look names and descriptions up in the FTS5 indexes instead of
+# LIKE-scanning the tables; the parameter is a _fts_query() expression.
+_AGENTS_SEARCH_WHERE = "WHERE rowid IN (SELECT rowid FROM agents_fts WHERE agents_fts MATCH ?)"
+_AGENTS_COUNT_SQL = {
+    False: "SELECT COUNT(*) FROM agents",
+    True: f"SELECT COUNT(*) FROM agents {_AGENTS_SEARCH_WHERE}",
+}
+_AGENTS_PAGE_SQL = {
+    (sort, direction, searching): f"""
+    SELECT name, description, karma, follower_count, following_count,
+           is_claimed, owner_x_handle, first_seen_at, created_at
+    FROM agents
+    {_AGENTS_SEARCH_WHERE if searching else ""}
+    ORDER BY {_order_by(sort, direction)}
+    LIMIT ? OFFSET ?
+"""
+    for sort in ("karma", "name", "follower_count", "first_seen_at")
+    for direction in ("ASC", "DESC")
+    for searching in (False, True)
+}
+
+_SUBMOLTS_SEARCH_WHERE = "WHERE rowid IN (SELECT rowid FROM submolts_fts WHERE submolts_fts MATCH ?)"
+_SUBMOLTS_COUNT_SQL = {
+    False: "SELECT COUNT(*) FROM submolts",
+    True: f"SELECT COUNT(*) FROM submolts {_SUBMOLTS_SEARCH_WHERE}",
+}
+_SUBMOLTS_PAGE_SQL = {
+    (sort, direction, searching): f"""
+    SELECT name, display_name, description, subscriber_count, post_count,
+           created_at, first_seen_at
+    FROM submolts
+    {_SUBMOLTS_SEARCH_WHERE if searching else ""}
+    ORDER BY {_order_by(sort, direction)}
+    LIMIT ? OFFSET ?
+"""
+    for sort in ("subscriber_count", "name", "post_count")
+    for direction in ("ASC", "DESC")
+    for searching in (False, True)
+}
+
+# Counts sort high-to-low, names A-Z
+_API_AGENTS_SQL = {
+    sort: f"""
+    SELECT name, description, karma, follower_count, following_count, is_claimed
+    FROM agents
+    ORDER BY {_order_by(sort, "ASC" if sort == "name" else "DESC")}
+    LIMIT ?
+"""
+    for sort in ("karma", "name", "follower_count")
+}
+
+# Post search conditions, in the order they're ANDed together. The posts
+# text match goes through posts_fts instead of a LIKE scan of posts.
+_SEARCH_CONDITIONS = {
+    "q": "rowid IN (SELECT rowid FROM posts_fts WHERE posts_fts MATCH ?)",
+    "author": "agent_name LIKE ?",
+    "submolt": "submolt = ?",
+    "date_from": "DATE(created_at) >= ?",
+    "date_to": "DATE(created_at) <= ?",
+    "min_score": "score >= ?",
+}
+
+
+@lru_cache(maxsize=None)
+def _search_sql(filters: tuple[str, ...], sort: str, direction: str) -> tuple[str, str]:
+    """(count, page) SQL for a /search filter combination, built once each.
+
+    filters are _SEARCH_CONDITIONS keys in that dict's order; sort and
+    direction are already restricted by the route's Query patterns, so
+    the cache holds at most a few hundred entries.
+    """
+    where = " AND ".join(_SEARCH_CONDITIONS[f] for f in filters)
+    where_clause = f"WHERE {where}" if where else ""
+    return (
+        f"SELECT COUNT(*) FROM posts {where_clause}",
+        f"""
+    SELECT id, agent_name, submolt, title, content, score, comment_count, created_at
+    FROM posts
+    {where_clause}
+    ORDER BY {sort} {direction}
+    LIMIT ? OFFSET ?
+""",
+    )
+
 
 # ============ PAGE ROUTES ============
 
 @router.get("/", response_class=HTMLResponse)
 async def index(request: Request):
     """Main dashboard page."""
-    import asyncio
 
     cache = get_cache()
     cached = cache.get("index:dashboard")
     if cached is not None:
         stats, sentiment, trends, new_agents, posts = cached
     else:
-        stats, sentiment, trends, new_agents, posts = await asyncio.gather(
-            get_stats(),
-            get_recent_sentiment(hours=24),
+        # Trends and new agents stay separate calls: they read other tables
+        # under their own caches ("words", refreshed by the word rollup, and
+        # "stats", by the snapshot), so they can't share the bundle's query
+        # or its drop-on-new-posts lifetime. gather runs all four at once.
+        (stats, sentiment), trends, new_agents, posts = await asyncio.gather(
+            get_dashboard_bundle(),
             get_trending_words(hours=24, limit=5),
             get_new_agents_today(),
-            execute_query("""
-                SELECT id, agent_name, submolt, title, content, score, comment_count, created_at
-                FROM posts
-                ORDER BY created_at DESC
-                LIMIT 20
-            """)
+            execute_query(_DASHBOARD_POSTS_SQL)
         )
         cache.set("index:dashboard", (stats, sentiment, trends, new_agents, posts), ttl_seconds=30)
 
@@ -78,31 +346,27 @@ async def agents_page(
     page: int = Query(1, ge=1),
 ):
     """Agent directory page with pagination and search."""
-    import asyncio
     order_sql = "DESC" if order == "desc" else "ASC"
     page_size = 20
     offset = (page - 1) * page_size
 
-    where_clause = ""
-    params = []
-    if search:
-        where_clause = "WHERE (name LIKE ? OR description LIKE ?)"
-        search_term = f"%{search}%"
-        params = [search_term, search_term]
-
-    total_result, agents = await asyncio.gather(
-        execute_query(f"SELECT COUNT(*) as count FROM agents {where_clause}", tuple(params)),
-        execute_query(f"""
-            SELECT name, description, karma, follower_count, following_count,
-                   is_claimed, owner_x_handle, first_seen_at, created_at
-            FROM agents
-            {where_clause}
-            ORDER BY {sort} {order_sql}
-            LIMIT ? OFFSET ?
-        """, tuple(params + [page_size, offset])),
+    searching = bool(search and search.strip())
+    params = [_fts_query(search)] if searching else []
+
+    if searching:
+        count = execute_scalar(_AGENTS_COUNT_SQL[True], tuple(params))
+    else:
+        # The directory total only moves when the poller adds agents; one
+        # COUNT(*) per 30 s is plenty for the pager.
+        count = get_cache().get_or_compute(
+            "agents:count", lambda: execute_scalar(_AGENTS_COUNT_SQL[False]), ttl_seconds=30
+        )
+    total_agents, agents = await asyncio.gather(
+        count,
+        execute_query(_AGENTS_PAGE_SQL[sort, order_sql, searching],
+                      tuple(params + [page_size, offset])),
     )
 
-    total_agents = total_result[0]["count"] if total_result else 0
     total_pages = (total_agents + page_size - 1) // page_size
 
     return templates.TemplateResponse("agents.html", {
@@ -126,7 +390,6 @@ async def agent_profile(
     refresh: bool = Query(False, description="Refresh stats from API"),
 ):
     """Individual agent profile page."""
-    import asyncio
 
     cache = get_cache()
     cache_key = f"agent_profile:{name}"
@@ -134,32 +397,20 @@ async def agent_profile(
     if refresh:
         cache.clear(cache_key)
         try:
-            from observatory.poller.client import get_client
-            from observatory.poller.processors import process_agent_profile
             client = await get_client()
             profile = await client.get_agent_profile(name)
             await process_agent_profile(profile)
         except Exception as e:
-            print(f"Failed to refresh agent {name}: {e}")
+            log.error("Failed to refresh agent %s: %s", name, e)
 
     cached = cache.get(cache_key)
     if cached is not None:
         agent_data, posts = cached
     else:
-        agent, post_count_result, posts = await asyncio.gather(
-            execute_query("""
-                SELECT name, description, karma, follower_count, following_count,
-                       is_claimed, owner_x_handle, first_seen_at, last_seen_at, created_at, avatar_url
-                FROM agents WHERE name = ?
-            """, (name,)),
-            execute_query("SELECT COUNT(*) as count FROM posts WHERE agent_name = ?", (name,)),
-            execute_query("""
-                SELECT id, submolt, title, content, score, comment_count, created_at
-                FROM posts
-                WHERE agent_name = ?
-                ORDER BY created_at DESC
-                LIMIT 20
-            """, (name,)),
+        agent, post_count, posts = await asyncio.gather(
+            execute_query(_AGENT_SQL, (name,)),
+            execute_scalar(_AGENT_POST_COUNT_SQL, (name,)),
+            execute_query(_AGENT_POSTS_SQL, (name,)),
         )
 
         if not agent:
@@ -170,7 +421,7 @@ async def agent_profile(
             }, status_code=404)
 
         agent_data = dict(agent[0])
-        agent_data["post_count"] = post_count_result[0]["count"] if post_count_result else 0
+        agent_data["post_count"] = post_count or 0
         if not refresh:
             cache.set(cache_key, (agent_data, posts), ttl_seconds=120)
 
@@ -186,7 +437,6 @@ async def agent_profile(
 @router.get("/posts/{post_id}", response_class=HTMLResponse)
 async def post_detail(request: Request, post_id: str):
     """Individual post detail page."""
-    import asyncio
 
     cache = get_cache()
     cache_key = f"post_detail:{post_id}"
@@ -196,15 +446,8 @@ async def post_detail(request: Request, post_id: str):
         post, comments = cached
     else:
         post, comments = await asyncio.gather(
-            execute_query("""
-                SELECT id, agent_name, submolt, title, content, score, comment_count, created_at
-                FROM posts WHERE id = ?
-            """, (post_id,)),
-            execute_query("""
-                SELECT id, agent_name, parent_id, content, score, created_at
-                FROM comments WHERE post_id = ?
-                ORDER BY created_at DESC LIMIT 50
-            """, (post_id,)),
+            execute_query(_POST_SQL, (post_id,)),
+            execute_query(_POST_COMMENTS_SQL, (post_id,)),
         )
         if post:
             cache.set(cache_key, (post, comments), ttl_seconds=300)
@@ -233,45 +476,44 @@ async def submolts_page(
     page: int = Query(1, ge=1),
 ):
     """Submolts (communities) directory page with pagination and search."""
-    import asyncio
     order_sql = "DESC" if order == "desc" else "ASC"
     page_size = 20
     offset = (page - 1) * page_size
 
-    where_clause = ""
-    params = []
-    if search:
-        where_clause = "WHERE (name LIKE ? OR display_name LIKE ? OR description LIKE ?)"
-        search_term = f"%{search}%"
-        params = [search_term, search_term, search_term]
-
-    total_result, submolts = await asyncio.gather(
-        execute_query(f"SELECT COUNT(*) as count FROM submolts {where_clause}", tuple(params)),
-        execute_query(f"""
-            SELECT name, display_name, description, subscriber_count, post_count,
-                   created_at, first_seen_at
-            FROM submolts
-            {where_clause}
-            ORDER BY {sort} {order_sql}
-            LIMIT ? OFFSET ?
-        """, tuple(params + [page_size, offset])),
-    )
+    searching = bool(search and search.strip())
+    params = [_fts_query(search)] if searching else []
 
-    total_submolts = total_result[0]["count"] if total_result else 0
-    total_pages = (total_submolts + page_size - 1) // page_size
+    async def render() -> bytes:
+        total_submolts, submolts = await asyncio.gather(
+            execute_scalar(_SUBMOLTS_COUNT_SQL[searching], tuple(params)),
+            execute_query(_SUBMOLTS_PAGE_SQL[sort, order_sql, searching],
+                          tuple(params + [page_size, offset])),
+        )
 
-    return templates.TemplateResponse("submolts.html", {
-        "request": request,
-        "submolts": submolts,
-        "total": total_submolts,
-        "current_sort": sort,
-        "current_order": order,
-        "current_search": search or "",
-        "page": page,
-        "total_pages": total_pages,
-        "page_size": page_size,
-        "config": config,
-    }, headers={"Cache-Control": _CC_MEDIUM})
+        total_pages = (total_submolts + page_size - 1) // page_size
+
+        return templates.TemplateResponse("submolts.html", {
+            "request": request,
+            "submolts": submolts,
+            "total": total_submolts,
+            "current_sort": sort,
+            "current_order": order,
+            "current_search": search or "",
+            "page": page,
+            "total_pages": total_pages,
+            "page_size": page_size,
+            "config": config,
+        }).body
+
+    # Only the first page of each sort is cached: it's what almost every
+    # visit lands on, and it keeps the key space to six entries.
+    if page == 1 and not search:
+        body = await get_cache().get_or_compute(
+            f"stats:page:submolts:{sort}:{order}", render, ttl_seconds=60
+        )
+    else:
+        body = await render()
+    return HTMLResponse(body, headers={"Cache-Control": _CC_MEDIUM})
 
 
 @router.get("/submolts/{name}", response_class=HTMLResponse)
@@ -281,7 +523,6 @@ async def submolt_detail(
     refresh: bool = Query(False, description="Refresh stats from API"),
 ):
     """Individual submolt detail page."""
-    import asyncio
 
     cache = get_cache()
     cache_key = f"submolt_detail:{name}"
@@ -289,43 +530,29 @@ async def submolt_detail(
     if refresh:
         cache.clear(cache_key)
         try:
-            from observatory.poller.client import get_client
-            from observatory.database.connection import get_db
 
             client = await get_client()
             data = await client.get_submolt(name)
             api_submolt_data = data.get("submolt", data)
 
             if api_submolt_data:
-                db = await get_db()
-                await db.execute("""
-                    UPDATE submolts SET subscriber_count = ?, post_count = ?
-                    WHERE name = ?
-                """, (
-                    api_submolt_data.get("subscriber_count", 0),
-                    api_submolt_data.get("post_count", 0),
-                    name,
-                ))
-                await db.commit()
+                async with transaction() as db:
+                    await db.execute(_SUBMOLT_REFRESH_SQL, (
+                        api_submolt_data.get("subscriber_count") or 0,
+                        api_submolt_data.get("post_count", 0),
+                        name,
+                    ))
         except Exception as e:
-            print(f"Failed to refresh submolt {name}: {e}")
+            log.error("Failed to refresh submolt %s: %s", name, e)
 
     cached = cache.get(cache_key)
     if cached is not None:
         submolt_data, posts = cached
     else:
-        submolt, actual_post_count_result, posts = await asyncio.gather(
-            execute_query("""
-                SELECT name, display_name, description, subscriber_count, post_count,
-                       created_at, first_seen_at, avatar_url, banner_url
-                FROM submolts WHERE name = ?
-            """, (name,)),
-            execute_query("SELECT COUNT(*) as count FROM posts WHERE submolt = ?", (name,)),
-            execute_query("""
-                SELECT id, agent_name, title, content, score, comment_count, created_at
-                FROM posts WHERE submolt = ?
-                ORDER BY created_at DESC LIMIT 20
-            """, (name,)),
+        submolt, actual_post_count, posts = await asyncio.gather(
+            execute_query(_SUBMOLT_SQL, (name,)),
+            execute_scalar(_SUBMOLT_POST_COUNT_SQL, (name,)),
+            execute_query(_SUBMOLT_POSTS_SQL, (name,)),
         )
 
         if not submolt:
@@ -336,7 +563,7 @@ async def submolt_detail(
             }, status_code=404)
 
         submolt_data = dict(submolt[0])
-        submolt_data["post_count"] = actual_post_count_result[0]["count"] if actual_post_count_result else 0
+        submolt_data["post_count"] = actual_post_count or 0
         if not refresh:
             cache.set(cache_key, (submolt_data, posts), ttl_seconds=120)
 
@@ -355,72 +582,51 @@ async def trends_page(
     hours: int = Query(24, ge=1, le=720),
 ):
     """Trends and topic analysis page."""
-    import asyncio
 
-    cache = get_cache()
-    cache_key = f"trends_page:{hours}"
-    cached = cache.get(cache_key)
-    if cached is not None:
-        trends, top_words, sentiment, snapshots = cached
-    else:
+    async def render() -> bytes:
         trends, top_words, sentiment, snapshots = await asyncio.gather(
             get_trending_words(hours=hours, limit=10),
             get_top_words(hours=hours, limit=10),
             get_recent_sentiment(hours=hours),
             get_snapshot_history(hours=hours)
         )
-        cache.set(cache_key, (trends, top_words, sentiment, snapshots), ttl_seconds=120)
+        return templates.TemplateResponse("trends.html", {
+            "request": request,
+            "trends": trends,
+            "top_words": top_words,
+            "sentiment": sentiment,
+            "snapshots": snapshots,
+            "hours": hours,
+            "config": config,
+        }).body
 
-    return templates.TemplateResponse("trends.html", {
-        "request": request,
-        "trends": trends,
-        "top_words": top_words,
-        "sentiment": sentiment,
-        "snapshots": snapshots,
-        "hours": hours,
-        "config": config,
-    }, headers={"Cache-Control": _CC_LONG})
+    # Rendered HTML is cached, so repeat hits skip the queries and Jinja
+    body = await get_cache().get_or_compute(f"words:page:trends:{hours}", render, ttl_seconds=120)
+    return HTMLResponse(body, headers={"Cache-Control": _CC_LONG})
 
 
 @router.get("/analytics", response_class=HTMLResponse)
 async def analytics_page(request: Request):
     """Analytics and insights page."""
-    import asyncio
-    import math
 
-    cache = get_cache()
-    cache_key = "analytics_page"
-    cached = cache.get(cache_key)
-    if cached is not None:
-        top_posters, activity_by_hour, submolt_activity, stats = cached
-    else:
+    async def render() -> bytes:
         top_posters, activity_by_hour, submolt_activity, stats = await asyncio.gather(
             get_top_posters(limit=15),
-            get_activity_by_hour(),
+            get_activity_histogram(),
             get_submolt_activity(limit=15),
             get_stats()
         )
-        cache.set(cache_key, (top_posters, activity_by_hour, submolt_activity, stats), ttl_seconds=120)
-
-    hours_data = {h["hour"]: h["post_count"] for h in activity_by_hour}
-    max_posts = max(hours_data.values()) if hours_data else 1
-    full_activity = []
-    for h in range(24):
-        count = hours_data.get(h, 0)
-        if count > 0 and max_posts > 0:
-            sqrt_height = max(int((math.sqrt(count) / math.sqrt(max_posts)) * 100), 3)
-        else:
-            sqrt_height = 0
-        full_activity.append({"hour": h, "post_count": count, "height_pct": sqrt_height})
+        return templates.TemplateResponse("analytics.html", {
+            "request": request,
+            "top_posters": top_posters,
+            "activity_by_hour": activity_by_hour,
+            "submolt_activity": submolt_activity,
+            "stats": stats,
+            "config": config,
+        }).body
 
-    return templates.TemplateResponse("analytics.html", {
-        "request": request,
-        "top_posters": top_posters,
-        "activity_by_hour": full_activity,
-        "submolt_activity": submolt_activity,
-        "stats": stats,
-        "config": config,
-    }, headers={"Cache-Control": _CC_LONG})
+    body = await get_cache().get_or_compute("stats:page:analytics", render, ttl_seconds=120)
+    return HTMLResponse(body, headers={"Cache-Control": _CC_LONG})
 
 
 @router.get("/export", response_class=HTMLResponse)
@@ -440,69 +646,67 @@ async def export_page(request: Request):
 @router.get("/api/feed")
 async def api_feed(
     since: Optional[str] = None,
+    before: Optional[str] = Query(None, description="created_at of the last post of the previous page"),
     limit: int = Query(20, ge=1, le=100),
 ):
-    """Get recent posts, optionally filtered by timestamp."""
-    if since:
-        posts = await execute_query("""
-            SELECT id, agent_name, submolt, title, content, score, comment_count, created_at
-            FROM posts
-            WHERE created_at > ?
-            ORDER BY created_at DESC
-            LIMIT ?
-        """, (since, limit))
+    """Get recent posts, optionally filtered by timestamp.
+
+    Page back through the feed by passing the oldest created_at seen as
+    ``before``; each page is a range scan on idx_posts_created_at.
+    """
+    if since and before:
+        posts = await execute_query(_FEED_BETWEEN_SQL, (since, before, limit))
+    elif since:
+        posts = await execute_query(_FEED_SINCE_SQL, (since, limit))
+    elif before:
+        posts = await execute_query(_FEED_BEFORE_SQL, (before, limit))
     else:
-        posts = await execute_query("""
-            SELECT id, agent_name, submolt, title, content, score, comment_count, created_at
-            FROM posts
-            ORDER BY created_at DESC
-            LIMIT ?
-        """, (limit,))
+        posts = await execute_query(_FEED_SQL, (limit,))
+
+    return ORJSONResponse({"posts": posts, "count": len(posts)},
+                          headers={"Cache-Control": _CC_SHORT})
 
-    return JSONResponse({"posts": posts, "count": len(posts)},
-                        headers={"Cache-Control": _CC_SHORT})
+
+async def _cached_json(cache_key: str, ttl_seconds: int, build, cache_control: str) -> Response:
+    """JSON response whose serialized body is cached, so hits skip orjson too.
+
+    cache_key starts with the observatory.cache namespace of the data it
+    serializes ("posts:", "words:", "stats:"), so the invalidate() calls
+    that drop that data drop the bytes with it.
+    """
+    async def compute() -> bytes:
+        return orjson.dumps(await build())
+
+    body = await get_cache().get_or_compute(cache_key, compute, ttl_seconds)
+    return Response(body, media_type="application/json",
+                    headers={"Cache-Control": cache_control})
 
 
 @router.get("/api/stats")
 async def api_stats():
     """Get current platform statistics."""
-    import asyncio
-
-    cache = get_cache()
-    cached = cache.get("api:stats")
-    if cached is not None:
-        stats, sentiment = cached
-    else:
-        stats, sentiment = await asyncio.gather(
-            get_stats(),
-            get_recent_sentiment(hours=24),
-        )
-        cache.set("api:stats", (stats, sentiment), ttl_seconds=60)
+    async def build():
+        stats, sentiment = await get_dashboard_bundle()
+        return {**stats, "sentiment": sentiment}
 
-    return JSONResponse({**stats, "sentiment": sentiment},
-                        headers={"Cache-Control": _CC_MEDIUM})
+    return await _cached_json("posts:api:stats", 60, build, _CC_MEDIUM)
 
 
 @router.get("/api/trends")
 async def api_trends(hours: int = Query(24, ge=1, le=720)):
     """Get trending words."""
-    cache = get_cache()
-    cache_key = f"api:trends:{hours}"
-    trends = cache.get(cache_key)
-    if trends is None:
-        trends = await get_trending_words(hours=hours, limit=10)
-        cache.set(cache_key, trends, ttl_seconds=120)
+    async def build():
+        return {"trends": await get_trending_words(hours=hours, limit=10), "period_hours": hours}
 
-    return JSONResponse({"trends": trends, "period_hours": hours},
-                        headers={"Cache-Control": _CC_LONG})
+    return await _cached_json(f"words:api:trends:{hours}", 120, build, _CC_LONG)
 
 
 @router.get("/api/trends/history")
 async def api_trends_history(word: str, days: int = Query(7, ge=1, le=30)):
     """Get word frequency history."""
     history = await get_word_history(word, days=days)
-    return JSONResponse({"word": word, "history": history},
-                        headers={"Cache-Control": _CC_LONG})
+    return ORJSONResponse({"word": word, "history": history},
+                          headers={"Cache-Control": _CC_LONG})
 
 
 @router.get("/api/agents")
@@ -515,23 +719,16 @@ async def api_agents(
     cache_key = f"api:agents:{sort}:{limit}"
     agents = cache.get(cache_key)
     if agents is None:
-        order = "DESC" if sort in ("karma", "follower_count") else "ASC"
-        agents = await execute_query(f"""
-            SELECT name, description, karma, follower_count, following_count, is_claimed
-            FROM agents
-            ORDER BY {sort} {order}
-            LIMIT ?
-        """, (limit,))
+        agents = await execute_query(_API_AGENTS_SQL[sort], (limit,))
         cache.set(cache_key, agents, ttl_seconds=60)
 
-    return JSONResponse({"agents": agents, "count": len(agents)},
-                        headers={"Cache-Control": _CC_MEDIUM})
+    return ORJSONResponse({"agents": agents, "count": len(agents)},
+                          headers={"Cache-Control": _CC_MEDIUM})
 
 
 @router.get("/api/agents/{name}")
 async def api_agent(name: str):
     """Get single agent details."""
-    import asyncio
 
     cache = get_cache()
     cache_key = f"api:agent:{name}"
@@ -540,204 +737,224 @@ async def api_agent(name: str):
         agent_data, posts = cached
     else:
         agent, posts = await asyncio.gather(
-            execute_query("""
-                SELECT name, description, karma, follower_count, following_count,
-                       is_claimed, owner_x_handle, first_seen_at, last_seen_at, created_at
-                FROM agents WHERE name = ?
-            """, (name,)),
-            execute_query("""
-                SELECT id, submolt, title, score, comment_count, created_at
-                FROM posts WHERE agent_name = ?
-                ORDER BY created_at DESC LIMIT 10
-            """, (name,)),
+            execute_query(_API_AGENT_SQL, (name,)),
+            execute_query(_API_AGENT_POSTS_SQL, (name,)),
         )
 
         if not agent:
-            return JSONResponse({"error": "Agent not found"}, status_code=404)
+            return ORJSONResponse({"error": "Agent not found"}, status_code=404)
 
         agent_data = agent[0]
         cache.set(cache_key, (agent_data, posts), ttl_seconds=120)
 
-    return JSONResponse({"agent": agent_data, "recent_posts": posts},
-                        headers={"Cache-Control": _CC_LONG})
+    return ORJSONResponse({"agent": agent_data, "recent_posts": posts},
+                          headers={"Cache-Control": _CC_LONG})
 
 
 @router.get("/api/submolts")
-async def api_submolts():
-    """Get all submolts."""
+async def api_submolts(
+    limit: int = Query(100, ge=1, le=500),
+    after: Optional[str] = Query(None, description="next_after cursor of the previous page"),
+):
+    """Get submolts by subscriber count, one page at a time."""
     cache = get_cache()
-    submolts = cache.get("api:submolts")
+    cache_key = f"api:submolts:{limit}:{after}"
+    submolts = cache.get(cache_key)
     if submolts is None:
-        submolts = await execute_query("""
-            SELECT name, display_name, description, subscriber_count, post_count
-            FROM submolts
-            ORDER BY subscriber_count DESC
-        """)
-        cache.set("api:submolts", submolts, ttl_seconds=120)
+        if after is None:
+            submolts = await execute_query(_API_SUBMOLTS_SQL, (limit,))
+        else:
+            # Cursor is "<subscriber_count>:<name>" of the last row seen
+            count, _, name = after.partition(":")
+            try:
+                count = int(count)
+            except ValueError:
+                return ORJSONResponse({"error": "Invalid cursor"}, status_code=400)
+            submolts = await execute_query(_API_SUBMOLTS_AFTER_SQL, (count, name, limit))
+        cache.set(cache_key, submolts, ttl_seconds=120)
+
+    next_after = None
+    if len(submolts) == limit:
+        last = submolts[-1]
+        next_after = f"{last['subscriber_count']}:{last['name']}"
 
-    return JSONResponse({"submolts": submolts},
-                        headers={"Cache-Control": _CC_LONG})
+    return ORJSONResponse({"submolts": submolts, "next_after": next_after},
+                          headers={"Cache-Control": _CC_LONG})
 
 
 @router.get("/api/analytics/top-posters")
 async def api_top_posters(limit: int = Query(20, ge=1, le=100)):
     """Get agents ranked by post count."""
-    posters = await get_top_posters(limit=limit)
-    return JSONResponse({"top_posters": posters},
-                        headers={"Cache-Control": _CC_LONG})
+    async def build():
+        return {"top_posters": await get_top_posters(limit=limit)}
+
+    return await _cached_json(f"stats:api:top_posters:{limit}", 300, build, _CC_LONG)
 
 
 @router.get("/api/analytics/activity-by-hour")
 async def api_activity_by_hour():
     """Get post activity grouped by hour of day."""
-    activity = await get_activity_by_hour()
-    hours_data = {h["hour"]: h["post_count"] for h in activity}
-    full_activity = [{"hour": h, "post_count": hours_data.get(h, 0)} for h in range(24)]
-    return JSONResponse({"activity_by_hour": full_activity},
-                        headers={"Cache-Control": _CC_LONG})
+    async def build():
+        return {"activity_by_hour": await get_activity_by_hour()}
+
+    return await _cached_json("stats:api:activity_by_hour", 900, build, _CC_LONG)
 
 
 @router.get("/api/analytics/submolt-activity")
 async def api_submolt_activity(limit: int = Query(20, ge=1, le=100)):
     """Get submolts ranked by post activity."""
-    activity = await get_submolt_activity(limit=limit)
-    return JSONResponse({"submolt_activity": activity},
-                        headers={"Cache-Control": _CC_LONG})
+    async def build():
+        return {"submolt_activity": await get_submolt_activity(limit=limit)}
+
+    return await _cached_json(f"stats:api:submolt_activity:{limit}", 300, build, _CC_LONG)
 
 
 @router.get("/api/graph")
 async def api_graph():
     """Get social graph data for visualization."""
-    import asyncio
 
     cache = get_cache()
-    cached = cache.get("api:graph")
-    if cached is not None:
-        agents, edges = cached
-    else:
+    body = cache.get("api:graph")
+    if body is None:
         agents, edges = await asyncio.gather(
-            execute_query("""
-                SELECT name, karma, follower_count
-                FROM agents WHERE karma > 0
-                ORDER BY karma DESC LIMIT 100
-            """),
-            execute_query("SELECT follower_id, following_id FROM follows"),
+            execute_query(_GRAPH_NODES_SQL),
+            execute_query(_GRAPH_EDGES_SQL),
         )
-        cache.set("api:graph", (agents, edges), ttl_seconds=300)
+        # Serialized once per cache fill; hits hand the bytes straight out
+        body = orjson.dumps({"nodes": agents, "links": edges})
+        cache.set("api:graph", body, ttl_seconds=300)
 
-    return JSONResponse({
-        "nodes": [{"id": a["name"], "karma": a["karma"], "followers": a["follower_count"]} for a in agents],
-        "links": [{"source": e["follower_id"], "target": e["following_id"]} for e in edges],
-    }, headers={"Cache-Control": _CC_STATIC})
+    return Response(body, media_type="application/json",
+                    headers={"Cache-Control": _CC_STATIC})
 
 
 # ============ EXPORT ROUTES ============
 
-@router.get("/api/export/posts.csv")
-async def export_posts_csv():
-    """Export all posts as CSV."""
-    posts = await execute_query("""
-        SELECT id, agent_name, submolt, title, content, score, comment_count, created_at
-        FROM posts ORDER BY created_at DESC
-    """)
-
-    data = []
-    for post in posts:
-        row = dict(post)
-        row["url"] = f"https://moltbook.com/post/{row['id']}"
-        if row.get("content"):
-            row["content"] = row["content"].replace('\r', '')
-        if row.get("title"):
-            row["title"] = row["title"].replace('\r', '')
-        data.append(row)
-
-    output = io.StringIO(newline='')
-    writer = csv.DictWriter(output, fieldnames=["id", "agent_name", "submolt", "title", "content", "url", "score", "comment_count", "created_at"], lineterminator='\n')
-    writer.writeheader()
-    writer.writerows(data)
-
-    output.seek(0)
+def _csv_stream(query: str, fieldnames: list[str], gzip_level: Optional[int] = None):
+    """Stream a query as CSV, one chunk per fetched batch of rows.
+
+    The query's columns must be in fieldnames order: each batch goes to
+    csv.writer.writerows() as is. With gzip_level set, chunks are one
+    continuous gzip stream instead.
+    """
+    async def generate():
+        output = io.StringIO(newline='')
+        writer = csv.writer(output, lineterminator='\n')
+        writer.writerow(fieldnames)
+        compressor = zlib.compressobj(gzip_level, wbits=31) if gzip_level is not None else None
+
+        def chunk() -> bytes:
+            data = output.getvalue().encode("utf-8")
+            output.seek(0)
+            output.truncate(0)
+            return compressor.compress(data) if compressor else data
+
+        yield chunk()
+        async for rows in execute_iter(query):
+            writer.writerows(rows)
+            yield chunk()
+        if compressor:
+            yield compressor.flush()
+
+    return generate()
+
+
+def _csv_response(request: Request, query: str, fieldnames: list[str], filename: str) -> StreamingResponse:
+    """Stream an export, gzipped here when the client accepts it.
+
+    Level 1 keeps the CPU cost of a full-table export low while still
+    shrinking the repetitive columns several times over; the response
+    carries its own Content-Encoding, so the app-wide GZip middleware
+    leaves it alone.
+    """
+    headers = {
+        "Content-Disposition": f"attachment; filename={filename}",
+        "Cache-Control": _CC_NOSTORE,
+        "Vary": "Accept-Encoding",
+    }
+    gzip_level = None
+    if accepts_gzip(request.headers):
+        gzip_level = 1
+        headers["Content-Encoding"] = "gzip"
     return StreamingResponse(
-        iter([output.getvalue()]),
+        _csv_stream(query, fieldnames, gzip_level),
         media_type="text/csv",
-        headers={
-            "Content-Disposition": "attachment; filename=moltbook_posts.csv",
-            "Cache-Control": _CC_NOSTORE,
-        }
+        headers=headers,
+    )
+
+
+@router.get("/api/export/posts.csv")
+async def export_posts_csv(request: Request):
+    """Export all posts as CSV."""
+    return _csv_response(
+        request, _EXPORT_POSTS_SQL,
+        ["id", "agent_name", "submolt", "title", "content", "url", "score", "comment_count", "created_at"],
+        "moltbook_posts.csv",
     )
 
 
 @router.get("/api/export/agents.csv")
-async def export_agents_csv():
+async def export_agents_csv(request: Request):
     """Export all agents as CSV."""
-    agents = await execute_query("""
-        SELECT name, description, karma, follower_count, following_count,
-               is_claimed, owner_x_handle, first_seen_at, created_at
-        FROM agents ORDER BY karma DESC
-    """)
-
-    output = io.StringIO(newline='')
-    writer = csv.DictWriter(output, fieldnames=["name", "description", "karma", "follower_count", "following_count", "is_claimed", "owner_x_handle", "first_seen_at", "created_at"], lineterminator='\n')
-    writer.writeheader()
-
-    for agent in agents:
-        row = dict(agent)
-        if row.get("description"):
-            row["description"] = row["description"].replace('\r', '')
-        writer.writerow(row)
-
-    output.seek(0)
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers={
-            "Content-Disposition": "attachment; filename=moltbook_agents.csv",
-            "Cache-Control": _CC_NOSTORE,
-        }
+    return _csv_response(
+        request, _EXPORT_AGENTS_SQL,
+        ["name", "description", "karma", "follower_count", "following_count", "is_claimed", "owner_x_handle", "first_seen_at", "created_at"],
+        "moltbook_agents.csv",
     )
 
 
 @router.get("/api/export/comments.csv")
-async def export_comments_csv():
+async def export_comments_csv(request: Request):
     """Export all comments as CSV."""
-    comments = await execute_query("""
-        SELECT id, post_id, agent_name, parent_id, content, score, created_at
-        FROM comments ORDER BY created_at DESC
-    """)
-
-    output = io.StringIO(newline='')
-    writer = csv.DictWriter(output, fieldnames=["id", "post_id", "post_url", "agent_name", "parent_id", "content", "score", "created_at"], lineterminator='\n')
-    writer.writeheader()
-
-    for comment in comments:
-        row = dict(comment)
-        row["post_url"] = f"https://moltbook.com/post/{row['post_id']}"
-        if row.get("content"):
-            row["content"] = row["content"].replace('\r', '')
-        writer.writerow(row)
-
-    output.seek(0)
-    return StreamingResponse(
-        iter([output.getvalue()]),
-        media_type="text/csv",
-        headers={
-            "Content-Disposition": "attachment; filename=moltbook_comments.csv",
-            "Cache-Control": _CC_NOSTORE,
-        }
+    return _csv_response(
+        request, _EXPORT_COMMENTS_SQL,
+        ["id", "post_id", "post_url", "agent_name", "parent_id", "content", "score", "created_at"],
+        "moltbook_comments.csv",
     )
 
 
+def _not_modified(request: Request, etag: str, mtime: float) -> bool:
+    """Whether the client's conditional-GET headers still match the file."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag in (tag.strip() for tag in if_none_match.split(","))
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return int(mtime) <= parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
 @router.get("/api/export/database.db")
-async def export_database():
-    """Download the SQLite database file."""
-    if config.DATABASE_PATH.exists():
-        return FileResponse(
-            config.DATABASE_PATH,
-            media_type="application/x-sqlite3",
-            filename="moltbook_observatory.db",
-            headers={"Cache-Control": _CC_NOSTORE},
-        )
-    return JSONResponse({"error": "Database not found"}, status_code=404)
+async def export_database(request: Request):
+    """Download the SQLite database file.
+
+    Tagged with the file's mtime and size, so a client re-downloading an
+    unchanged file gets a 304 instead of the whole database.
+    """
+    try:
+        stat = config.DATABASE_PATH.stat()
+    except FileNotFoundError:
+        return ORJSONResponse({"error": "Database not found"}, status_code=404)
+
+    headers = {
+        "ETag": f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"',
+        "Last-Modified": formatdate(stat.st_mtime, usegmt=True),
+        # Store, but revalidate on every download
+        "Cache-Control": "no-cache",
+    }
+    if _not_modified(request, headers["ETag"], stat.st_mtime):
+        return Response(status_code=304, headers=headers)
+
+    return FileResponse(
+        config.DATABASE_PATH,
+        media_type="application/x-sqlite3",
+        filename="moltbook_observatory.db",
+        headers=headers,
+        stat_result=stat,
+    )
 
 
 # ============ HTMX PARTIALS ============
@@ -749,19 +966,12 @@ async def feed_partial(
     per_page: int = Query(20, ge=1, le=100)
 ):
     """HTMX partial for feed updates with pagination."""
-    import asyncio
-
-    count_result, posts = await asyncio.gather(
-        execute_query("SELECT COUNT(*) as count FROM posts"),
-        execute_query("""
-            SELECT id, agent_name, submolt, title, content, score, comment_count, created_at
-            FROM posts
-            ORDER BY created_at DESC
-            LIMIT ? OFFSET ?
-        """, (per_page, (page - 1) * per_page)),
+
+    total_posts, posts = await asyncio.gather(
+        execute_scalar(_POST_COUNT_SQL),
+        execute_query(_FEED_PAGE_SQL, (per_page, (page - 1) * per_page)),
     )
 
-    total_posts = count_result[0]["count"] if count_result else 0
     total_pages = (total_posts + per_page - 1) // per_page if total_posts > 0 else 1
 
     return templates.TemplateResponse("feed.html", {
@@ -790,45 +1000,26 @@ async def search_posts(
     per_page: int = Query(20, ge=1, le=100),
 ):
     """Search posts with multiple filters and pagination."""
-    import asyncio
-    where_conditions = []
-    params = []
-
-    if q:
-        where_conditions.append("(content LIKE ? OR title LIKE ?)")
-        params.extend([f"%{q}%", f"%{q}%"])
-    if author:
-        where_conditions.append("agent_name LIKE ?")
-        params.append(f"%{author}%")
-    if submolt:
-        where_conditions.append("submolt = ?")
-        params.append(submolt)
-    if date_from:
-        where_conditions.append("DATE(created_at) >= ?")
-        params.append(date_from)
-    if date_to:
-        where_conditions.append("DATE(created_at) <= ?")
-        params.append(date_to)
-    if min_score is not None:
-        where_conditions.append("score >= ?")
-        params.append(min_score)
-
-    where_clause = f"WHERE {' AND '.join(where_conditions)}" if where_conditions else ""
+    values = {
+        "q": _fts_query(q) if q and q.strip() else None,
+        "author": f"%{author}%" if author else None,
+        "submolt": submolt or None,
+        "date_from": date_from or None,
+        "date_to": date_to or None,
+        "min_score": min_score,
+    }
+    filters = tuple(name for name in _SEARCH_CONDITIONS if values[name] is not None)
+    params = [values[name] for name in filters]
+
     order_sql = "DESC" if order == "desc" else "ASC"
     offset = (page - 1) * per_page
+    count_sql, page_sql = _search_sql(filters, sort, order_sql)
 
-    count_result, posts = await asyncio.gather(
-        execute_query(f"SELECT COUNT(*) as count FROM posts {where_clause}", tuple(params)),
-        execute_query(f"""
-            SELECT id, agent_name, submolt, title, content, score, comment_count, created_at
-            FROM posts
-            {where_clause}
-            ORDER BY {sort} {order_sql}
-            LIMIT ? OFFSET ?
-        """, tuple(params + [per_page, offset])),
+    total_results, posts = await asyncio.gather(
+        execute_scalar(count_sql, tuple(params)),
+        execute_query(page_sql, tuple(params + [per_page, offset])),
     )
 
-    total_results = count_result[0]["count"] if count_result else 0
     total_pages = (total_results + per_page - 1) // per_page if total_results > 0 else 1
 
     return templates.TemplateResponse("search_results.html", {
@@ -855,15 +1046,16 @@ async def search_posts(
 @router.get("/partials/stats", response_class=HTMLResponse)
 async def stats_partial(request: Request):
     """HTMX partial for stats updates."""
-    import asyncio
-    stats, sentiment = await asyncio.gather(
-        get_stats(),
-        get_recent_sentiment(hours=24),
-    )
 
-    return templates.TemplateResponse("stats_partial.html", {
-        "request": request,
-        "stats": stats,
-        "sentiment": sentiment,
-        "config": config,
-    }, headers={"Cache-Control": _CC_SHORT})
+    async def render() -> bytes:
+        stats, sentiment = await get_dashboard_bundle()
+        return templates.TemplateResponse("stats_partial.html", {
+            "request": request,
+            "stats": stats,
+            "sentiment": sentiment,
+            "config": config,
+        }).body
+
+    # Every open dashboard polls this; one render per 10 s serves them all
+    body = await get_cache().get_or_compute("posts:partial:stats", render, ttl_seconds=10)
+    return HTMLResponse(body, headers={"Cache-Control": _CC_SHORT})
@@ -0,0 +1,8 @@
+"""Point the app at a scratch database before anything imports its config."""
+
+import os
+import tempfile
+
+os.environ["DATABASE_PATH"] = os.path.join(tempfile.mkdtemp(), "observatory.db")
+os.environ.setdefault("MOLTBOOK_API_KEY", "test")
+os.environ["DISABLE_POLL"] = "true"
@@ -0,0 +1,20 @@
+"""Accept-Encoding negotiation for gzip."""
+
+import pytest
+
+from observatory.web.compression import accepts_gzip
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("gzip", True),
+    ("gzip, deflate, br", True),
+    ("br, gzip;q=0.3", True),
+    ("*", True),
+    ("gzip;q=0", False),
+    ("gzip; q=0.000", False),
+    ("*, gzip;q=0", False),
+    ("identity", False),
+    ("", False),
+])
+def test_accepts_gzip(value, expected):
+    assert accepts_gzip({"accept-encoding": value}) is expected
@@ -0,0 +1,86 @@
+"""Conditional GET: a tag must always identify exactly one body."""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from observatory.cache import get_cache
+from observatory.main import app
+from observatory.poller.processors import process_posts
+
+PATHS = ["/", "/api/feed", "/api/stats", "/analytics", "/trends", "/partials/stats"]
+
+
+def _posts(start: int, count: int) -> dict:
+    now = datetime.utcnow()
+    return {"posts": [
+        {
+            "id": f"p{i}",
+            "title": f"post {i}",
+            "content": "hello from the test suite",
+            "upvotes": i,
+            "downvotes": 0,
+            "created_at": (now - timedelta(minutes=i)).isoformat(),
+            "submolt": "general",
+            "author": {"id": f"agent-{i % 3}", "name": f"agent{i % 3}", "karma": i},
+        }
+        for i in range(start, start + count)
+    ]}
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        c.portal.call(process_posts, _posts(0, 5))
+        yield c
+
+
+def test_tag_never_maps_to_two_bodies(client):
+    seen: dict[str, bytes] = {}
+
+    def record():
+        for path in PATHS:
+            r = client.get(path)
+            assert r.status_code == 200
+            etag = r.headers["etag"]
+            assert seen.setdefault(etag, r.content) == r.content, path
+
+    record()
+    # A write lands while some route caches still hold the older data...
+    client.portal.call(process_posts, _posts(5, 3))
+    record()
+    # ...and those caches then expire with no further write
+    get_cache().clear_all()
+    record()
+
+
+def test_matching_tag_is_not_modified(client):
+    r = client.get("/api/feed")
+    again = client.get("/api/feed", headers={"If-None-Match": r.headers["etag"]})
+    assert again.status_code == 304
+    assert again.headers["etag"] == r.headers["etag"]
+    assert again.content == b""
+
+
+def test_not_modified_repeats_caching_headers(client):
+    # "/" is big enough to be gzipped, so its 200 carries Vary
+    r = client.get("/", headers={"Accept-Encoding": "gzip"})
+    assert r.headers["vary"] == "Accept-Encoding"
+    again = client.get("/", headers={"Accept-Encoding": "gzip", "If-None-Match": r.headers["etag"]})
+    assert again.status_code == 304
+    assert again.headers["cache-control"] == r.headers["cache-control"]
+    assert again.headers["vary"] == r.headers["vary"]
+
+
+def test_changed_body_gets_new_tag(client):
+    r = client.get("/api/feed")
+    client.portal.call(process_posts, _posts(20, 1))
+    fresh = client.get("/api/feed", headers={"If-None-Match": r.headers["etag"]})
+    assert fresh.status_code == 200
+    assert fresh.headers["etag"] != r.headers["etag"]
+    assert fresh.content != r.content
+
+
+def test_no_store_responses_are_untagged(client):
+    assert "etag" not in client.get("/search?q=hello").headers
@@ -0,0 +1,50 @@
+"""/api/submolts keyset paging."""
+
+import pytest
+from fastapi.testclient import TestClient
+
+from observatory.cache import get_cache
+from observatory.database.connection import transaction
+from observatory.database.migrations import init_db
+from observatory.main import app
+from observatory.poller.processors import process_submolts
+
+
+@pytest.fixture(scope="module")
+def client():
+    with TestClient(app) as c:
+        yield c
+
+
+def _walk(client, limit: int = 1) -> list[str]:
+    names, after = [], None
+    while True:
+        params = {"limit": limit} if after is None else {"limit": limit, "after": after}
+        r = client.get("/api/submolts", params=params)
+        assert r.status_code == 200
+        body = r.json()
+        names += [s["name"] for s in body["submolts"]]
+        after = body["next_after"]
+        if after is None:
+            return names
+
+
+def test_pages_reach_null_subscriber_counts(client):
+    client.portal.call(process_submolts, {"submolts": [
+        {"name": "a", "subscriber_count": 5},
+        {"name": "b", "subscriber_count": None},
+        {"name": "c", "subscriber_count": None},
+    ]})
+    get_cache().clear_all()
+    assert _walk(client) == ["a", "c", "b"]
+
+
+def test_init_db_fills_legacy_null_counts(client):
+    async def store_legacy_row():
+        async with transaction() as db:
+            await db.execute("INSERT INTO submolts (name, subscriber_count) VALUES ('d', NULL)")
+        await init_db()
+
+    client.portal.call(store_legacy_row)
+    get_cache().clear_all()
+    assert _walk(client) == ["a", "d", "c", "b"]